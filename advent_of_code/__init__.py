@@ -1,9 +1,15 @@
 """Advent of Code 2022."""
 
+from contextlib import nullcontext
+from functools import partial
+from pathlib import Path
 from typing import Final, Protocol
 
-from typer import Typer
+from typer import BadParameter, Exit, Typer
 
+from advent_of_code import benchmarks, metrics
+from advent_of_code.caching import registry
+from advent_of_code.profiling import SamplingProfiler
 from advent_of_code.puzzles import (
     day01,
     day02,
@@ -22,6 +28,12 @@ from advent_of_code.puzzles import (
     day15,
     day16,
 )
+from advent_of_code.scheduler import (
+    TimingHistory,
+    make_schedule,
+    profile_day,
+    run_schedule,
+)
 
 app = Typer()
 
@@ -67,25 +79,143 @@ def _get_puzzle(day: int) -> AdventOfCodeDayModule:
     return PUZZLES[day - 1]
 
 
-def _run_all_puzzles() -> None:
-    for puzzle in PUZZLES:
+def _run(puzzle: AdventOfCodeDayModule, cache_stats: bool = False) -> None:
+    with registry.scope("run"):
+        registry.reset_stats()
         puzzle.main()
+        if cache_stats and len(registry.caches) > 0:
+            print(registry)
+
+
+def _run_day(day: int, cache_stats: bool = False) -> None:
+    _run(_get_puzzle(day), cache_stats=cache_stats)
 
 
-def _run_puzzle(day: int) -> None:
-    _get_puzzle(day).main()
+def _run_sequential(
+    puzzles: list[AdventOfCodeDayModule],
+    cache_stats: bool = False,
+    history: TimingHistory | None = None,
+) -> None:
+    for puzzle in puzzles:
+        fxn = partial(_run, puzzle, cache_stats=cache_stats)
+        if history is None:
+            fxn()
+        else:
+            history.record(puzzle.DAY, profile_day(fxn))
+
+
+def _run_parallel(
+    puzzles: list[AdventOfCodeDayModule],
+    workers: int,
+    cache_stats: bool = False,
+    history: TimingHistory | None = None,
+) -> None:
+    schedule = make_schedule([p.DAY for p in puzzles], history or TimingHistory())
+    run_schedule(schedule, partial(_run_day, cache_stats=cache_stats), workers)
 
 
 @app.command()
-def run_puzzles(day: int | None = None) -> None:
+def run_puzzles(
+    day: int | None = None,
+    cache_stats: bool = False,
+    metrics_file: Path | None = None,
+    metrics_format: metrics.MetricsFormat = metrics.MetricsFormat.PROMETHEUS,
+    profile_file: Path | None = None,
+    profile_rate: float = 100.0,
+    workers: int = 1,
+    history_file: Path | None = None,
+) -> None:
     """Run puzzles.
 
     Args:
         day (int | None, optional): Specific day to run the puzzles for. Defaults to
         `None` to run all puzzles.
+        cache_stats (bool, optional): Print the hit, miss, and eviction counts of
+        the memoization caches after each day. Defaults to `False`.
+        metrics_file (Path | None, optional): File to write the hot-path operation
+        counters to. Defaults to `None` to not export the counters.
+        metrics_format (MetricsFormat, optional): Format of the exported counters.
+        Defaults to Prometheus text format.
+        profile_file (Path | None, optional): File to write collapsed stacks from
+        the sampling profiler to. Defaults to `None` to not profile.
+        profile_rate (float, optional): Profiler samples per second. Defaults to
+        100.
+        workers (int, optional): Number of days to run concurrently. With more than
+        one worker, days are scheduled longest-first across threads and processes
+        using the timing history. Defaults to 1.
+        history_file (Path | None, optional): JSON file of per-day timing
+        profiles. Sequential runs record to it and parallel runs schedule from it.
+        Defaults to `None`.
     """
+    if workers > 1 and (metrics_file is not None or profile_file is not None):
+        raise BadParameter("Metrics and profiling require running with one worker.")
+
     print("--- Advent of Code 2022 ---")
-    if day is None:
-        _run_all_puzzles()
+    puzzles = PUZZLES if day is None else [_get_puzzle(day)]
+    history = None if history_file is None else TimingHistory.load(history_file)
+    metrics.registry.reset()
+    profiler = SamplingProfiler(rate=profile_rate) if profile_file else None
+    with profiler or nullcontext():
+        if workers > 1:
+            _run_parallel(puzzles, workers, cache_stats=cache_stats, history=history)
+        else:
+            _run_sequential(puzzles, cache_stats=cache_stats, history=history)
+    if workers == 1 and history is not None and history_file is not None:
+        history.save(history_file)
+    if profiler is not None and profile_file is not None:
+        profiler.write(profile_file)
+        print(
+            f"profiler: {profiler.n_samples} samples"
+            + f" ({profiler.overhead:.2%} overhead) written to '{profile_file}'"
+        )
+    if metrics_file is not None:
+        metrics.registry.export(metrics_file, fmt=metrics_format)
+
+
+@app.command()
+def bench(
+    day: int | None = None,
+    micro: bool = False,
+    pattern: str | None = None,
+    repeats: int | None = None,
+    baseline_file: Path = Path("benchmarks.json"),
+    save: bool = False,
+    tolerance: float = 0.1,
+) -> None:
+    """Benchmark the puzzles and compare against a baseline.
+
+    Args:
+        day (int | None, optional): Specific day to benchmark. Defaults to `None` to
+        benchmark all days.
+        micro (bool, optional): Benchmark the registered solver kernels instead of
+        whole days. Defaults to `False`.
+        pattern (str | None, optional): Only run kernels whose name contains this
+        string. Defaults to `None`.
+        repeats (int | None, optional): Number of timing repeats (the best is
+        kept). Defaults to 5 for kernels and 1 for days.
+        baseline_file (Path, optional): JSON file of baseline times. Defaults to
+        "benchmarks.json".
+        save (bool, optional): Save the results as the new baseline. Defaults to
+        `False`.
+        tolerance (float, optional): Allowed fractional slowdown before a result is
+        reported as a regression. Defaults to 0.1.
+    """
+    if micro:
+        results = benchmarks.run_microbenchmarks(pattern=pattern, repeats=repeats or 5)
     else:
-        _run_puzzle(day=day)
+        puzzles = PUZZLES if day is None else [_get_puzzle(day)]
+        days = {f"day{p.DAY:02d}": partial(_run, p) for p in puzzles}
+        results = benchmarks.run_day_benchmarks(days, repeats=repeats or 1)
+    for result in results:
+        print(result)
+
+    regressions = benchmarks.find_regressions(
+        results, benchmarks.load_baseline(baseline_file), tolerance=tolerance
+    )
+    if save:
+        benchmarks.save_baseline(results, baseline_file)
+    if len(regressions) > 0:
+        print("Regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        raise Exit(code=1)
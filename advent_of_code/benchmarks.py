@@ -0,0 +1,202 @@
+"""Benchmarking whole days and individual solver kernels.
+
+Kernels are registered with the `microbenchmark` decorator along with a factory
+that builds representative arguments. Kernels run inside the "input" cache scope
+so memoized results do not outlive a timing repeat. Both day-level and
+kernel-level results are stored in the same baseline format: a JSON object mapping
+each benchmark name to its best time per call in seconds.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import timeit
+from collections.abc import Callable, Iterable, Mapping
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from io import StringIO
+from pathlib import Path
+from typing import Any, TypeVar
+
+from advent_of_code.caching import registry
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+ArgsFactory = Callable[[], tuple[tuple[Any, ...], dict[str, Any]]]
+
+
+@dataclass
+class Microbenchmark:
+    """Registered solver kernel with a factory for its arguments."""
+
+    name: str
+    fxn: Callable[..., Any]
+    make_args: ArgsFactory
+    fresh_args: bool = False
+
+
+@dataclass
+class BenchmarkResult:
+    """Best time per call of a benchmark."""
+
+    name: str
+    seconds: float
+    loops: int
+    repeats: int
+
+    def __str__(self) -> str:
+        return f"{self.name}: {_fmt_time(self.seconds)} ({self.repeats}x{self.loops})"
+
+
+@dataclass
+class Regression:
+    """Benchmark that is slower than its baseline."""
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """Current time relative to the baseline time."""
+        return self.current / self.baseline
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {_fmt_time(self.baseline)} -> {_fmt_time(self.current)}"
+            + f" ({self.ratio:.2f}x)"
+        )
+
+
+MICROBENCHMARKS: dict[str, Microbenchmark] = {}
+
+# Maximum number of fresh argument sets built at once (bounds memory use).
+_FRESH_ARGS_BATCH: int = 1_000
+
+
+def _fmt_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def microbenchmark(
+    make_args: ArgsFactory, fresh_args: bool = False
+) -> Callable[[F], F]:
+    """Register a solver kernel as a microbenchmark.
+
+    Args:
+        make_args (ArgsFactory): Function returning the positional and keyword
+        arguments to call the kernel with. By default it is called once per
+        timing repeat and every call in the repeat shares the arguments.
+        fresh_args (bool, optional): Build new arguments for every call (outside
+        of the timed region) for kernels that mutate their arguments. Defaults to
+        `False`.
+
+    Returns:
+        Callable[[F], F]: Decorator that returns the kernel unchanged.
+    """
+
+    def decorator(fxn: F) -> F:
+        module = fxn.__module__.split(".")[-1]
+        name = f"{module}.{fxn.__name__}"
+        MICROBENCHMARKS[name] = Microbenchmark(
+            name=name, fxn=fxn, make_args=make_args, fresh_args=fresh_args
+        )
+        return fxn
+
+    return decorator
+
+
+def _time_calls(bench: Microbenchmark, loops: int) -> float:
+    fxn, elapsed = bench.fxn, 0.0
+    with registry.scope("input"):
+        if not bench.fresh_args:
+            args, kwargs = bench.make_args()
+            return timeit.Timer(lambda: fxn(*args, **kwargs)).timeit(loops)
+        for start in range(0, loops, _FRESH_ARGS_BATCH):
+            n = min(_FRESH_ARGS_BATCH, loops - start)
+            calls = [bench.make_args() for _ in range(n)]
+            t0 = time.perf_counter()
+            for args, kwargs in calls:
+                fxn(*args, **kwargs)
+            elapsed += time.perf_counter() - t0
+    return elapsed
+
+
+def _calibrate_loops(bench: Microbenchmark, min_seconds: float = 0.2) -> int:
+    # Same sequence of loop counts as `timeit.Timer.autorange()`.
+    i = 1
+    while True:
+        for loops in (i, 2 * i, 5 * i):
+            if _time_calls(bench, loops) >= min_seconds:
+                return loops
+        i *= 10
+
+
+def time_kernel(bench: Microbenchmark, repeats: int = 5) -> BenchmarkResult:
+    """Time a kernel with the number of loops calibrated to take at least 0.2 s."""
+    loops = _calibrate_loops(bench)
+    best = min(_time_calls(bench, loops) / loops for _ in range(repeats))
+    return BenchmarkResult(bench.name, seconds=best, loops=loops, repeats=repeats)
+
+
+def run_microbenchmarks(
+    pattern: str | None = None, repeats: int = 5
+) -> list[BenchmarkResult]:
+    """Time each registered kernel (optionally only those containing `pattern`)."""
+    results: list[BenchmarkResult] = []
+    for name, bench in sorted(MICROBENCHMARKS.items()):
+        if pattern is None or pattern in name:
+            results.append(time_kernel(bench, repeats=repeats))
+    return results
+
+
+def run_day_benchmarks(
+    days: Mapping[str, Callable[[], None]], repeats: int = 1
+) -> list[BenchmarkResult]:
+    """Time running each day's puzzles once, hiding their printed output."""
+    results: list[BenchmarkResult] = []
+    for name, run_day in days.items():
+        with redirect_stdout(StringIO()):
+            best = min(timeit.Timer(run_day).repeat(repeat=repeats, number=1))
+        results.append(BenchmarkResult(name, seconds=best, loops=1, repeats=repeats))
+    return results
+
+
+def load_baseline(path: Path) -> dict[str, float]:
+    """Load baseline times (empty if the file does not exist)."""
+    if not path.exists():
+        return {}
+    return {k: float(v) for k, v in json.loads(path.read_text()).items()}
+
+
+def save_baseline(results: Iterable[BenchmarkResult], path: Path) -> None:
+    """Update baseline times with new results, keeping any other entries."""
+    baseline = load_baseline(path)
+    baseline.update({r.name: r.seconds for r in results})
+    path.write_text(json.dumps(dict(sorted(baseline.items())), indent=2) + "\n")
+
+
+def find_regressions(
+    results: Iterable[BenchmarkResult], baseline: dict[str, float], tolerance: float
+) -> list[Regression]:
+    """Find benchmarks slower than their baseline by more than `tolerance`.
+
+    Args:
+        results (Iterable[BenchmarkResult]): Current benchmark results.
+        baseline (dict[str, float]): Baseline times.
+        tolerance (float): Allowed fractional slowdown (e.g. 0.1 for 10 %).
+
+    Returns:
+        list[Regression]: Benchmarks that regressed.
+    """
+    regressions: list[Regression] = []
+    for r in results:
+        if (base := baseline.get(r.name)) is None:
+            continue
+        if r.seconds > base * (1 + tolerance):
+            regressions.append(Regression(r.name, baseline=base, current=r.seconds))
+    return regressions
@@ -0,0 +1,274 @@
+"""Scoped memoization with bounded LRU eviction.
+
+Every cache belongs to a named scope (e.g. `"run"` for a single day's run or
+`"input"` for a single puzzle input) and is emptied whenever that scope is exited,
+so long-lived processes neither grow without bound nor return results computed for
+a different input.
+
+Cache entries and counters are kept per thread, so days run concurrently in
+threads each see only their own entries and entering or leaving a scope in one
+thread does not empty the caches of another.
+"""
+
+from __future__ import annotations
+
+import functools
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Generic, ParamSpec, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+P = ParamSpec("P")
+T = TypeVar("T")
+
+_MISSING: Any = object()
+
+
+@dataclass
+class CacheStats:
+    """Usage counters for a single cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    nbytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that were found in the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """Least-recently-used cache bounded by number of entries and/or memory.
+
+    Memory is estimated with `sys.getsizeof()` on each key and value so it is a
+    shallow approximation of the true footprint.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        scope: str = "run",
+        maxsize: int | None = 1024,
+        maxbytes: int | None = None,
+    ) -> None:
+        self.name = name
+        self.scope = scope
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self._local = threading.local()
+
+    def __str__(self) -> str:
+        s = self.stats
+        return (
+            f"cache '{self.name}' [{self.scope}]: {s.size} entries, {s.nbytes} bytes,"
+            + f" {s.hits} hits, {s.misses} misses, {s.evictions} evictions"
+            + f" ({s.hit_rate:.1%} hit rate)"
+        )
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data
+
+    def _state(self) -> tuple[OrderedDict[K, tuple[V, int]], CacheStats]:
+        # Entries and counters of the current thread.
+        try:
+            state: tuple[OrderedDict[K, tuple[V, int]], CacheStats]
+            state = self._local.state
+        except AttributeError:
+            state = self._local.state = (OrderedDict(), CacheStats())
+        return state
+
+    @property
+    def _data(self) -> OrderedDict[K, tuple[V, int]]:
+        return self._state()[0]
+
+    @property
+    def stats(self) -> CacheStats:
+        """Usage counters of the current thread."""
+        return self._state()[1]
+
+    @property
+    def bounded(self) -> bool:
+        """Whether entries can ever be evicted."""
+        return self.maxsize is not None or self.maxbytes is not None
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Get a value from the cache, counting the lookup as a hit or miss."""
+        data, stats = self._state()
+        if key not in data:
+            stats.misses += 1
+            return default
+        stats.hits += 1
+        data.move_to_end(key)
+        return data[key][0]
+
+    def put(self, key: K, value: V) -> None:
+        """Add a value to the cache, evicting the least recently used entries."""
+        nbytes = sys.getsizeof(key) + sys.getsizeof(value)
+        data, stats = self._state()
+        if key in data:
+            self._remove(key)
+        data[key] = (value, nbytes)
+        stats.size += 1
+        stats.nbytes += nbytes
+        while self._over_limit():
+            self._remove(next(iter(data)))
+            stats.evictions += 1
+
+    def _over_limit(self) -> bool:
+        if len(self._data) <= 1:
+            return False
+        if self.maxsize is not None and len(self._data) > self.maxsize:
+            return True
+        return self.maxbytes is not None and self.stats.nbytes > self.maxbytes
+
+    def _remove(self, key: K) -> None:
+        _, nbytes = self._data.pop(key)
+        self.stats.size -= 1
+        self.stats.nbytes -= nbytes
+
+    def invalidate(self, key: K | None = None) -> None:
+        """Remove a single entry or, if no key is given, every entry."""
+        data, stats = self._state()
+        if key is None:
+            data.clear()
+            stats.size, stats.nbytes = 0, 0
+        elif key in data:
+            self._remove(key)
+
+
+_KWARGS_MARK: Any = object()
+
+
+def _default_key(*args: Any, **kwargs: Any) -> Hashable:
+    if not kwargs:
+        return args
+    return (*args, _KWARGS_MARK, *sorted(kwargs.items()))
+
+
+class CacheRegistry:
+    """Collection of all of the scoped caches."""
+
+    def __init__(self) -> None:
+        self.caches: dict[str, LRUCache] = {}
+
+    def cache(
+        self,
+        name: str,
+        scope: str = "run",
+        maxsize: int | None = 1024,
+        maxbytes: int | None = None,
+    ) -> LRUCache:
+        """Get a cache by name, creating it if it does not yet exist."""
+        if name not in self.caches:
+            self.caches[name] = LRUCache(
+                name, scope=scope, maxsize=maxsize, maxbytes=maxbytes
+            )
+        return self.caches[name]
+
+    def memoize(
+        self,
+        scope: str = "run",
+        maxsize: int | None = 1024,
+        maxbytes: int | None = None,
+        key: Callable[..., Hashable] = _default_key,
+    ) -> Callable[[Callable[P, T]], Callable[P, T]]:
+        """Memoize a function in a scoped cache.
+
+        Args:
+            scope (str, optional): Scope of the cache. Defaults to "run".
+            maxsize (int | None, optional): Maximum number of entries. Defaults to
+            1024.
+            maxbytes (int | None, optional): Maximum approximate memory use in
+            bytes. Defaults to `None` for no memory limit.
+            key (Callable[..., Hashable], optional): Function of the decorated
+            function's arguments that returns the cache key. Defaults to using all
+            of the arguments.
+
+        Returns:
+            Callable[[Callable[P, T]], Callable[P, T]]: Decorator.
+        """
+
+        def decorator(func: Callable[P, T]) -> Callable[P, T]:
+            name = f"{func.__module__}.{func.__qualname__}"
+            cache = self.cache(name, scope=scope, maxsize=maxsize, maxbytes=maxbytes)
+
+            default_key, unbounded = key is _default_key, not cache.bounded
+            local = cache._local
+
+            @functools.wraps(func)
+            def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+                # Positional arguments are already a cheap key.
+                k = args if default_key and not kwargs else key(*args, **kwargs)
+                if unbounded:
+                    # Fast path: hits on an unbounded cache skip the recency
+                    # update.
+                    try:
+                        data, stats = local.state
+                    except AttributeError:
+                        data, stats = cache._state()
+                    entry = data.get(k)
+                    if entry is not None:
+                        stats.hits += 1
+                        return entry[0]
+                value: Any = cache.get(k, _MISSING)
+                if value is _MISSING:
+                    value = func(*args, **kwargs)
+                    cache.put(k, value)
+                return value
+
+            wrapper.cache = cache  # type: ignore[attr-defined]
+            return wrapper
+
+        return decorator
+
+    def invalidate(self, scope: str | None = None) -> None:
+        """Empty all caches in a scope (or all caches if no scope is given)."""
+        for cache in self.caches.values():
+            if scope is None or cache.scope == scope:
+                cache.invalidate()
+
+    @contextmanager
+    def scope(self, scope: str) -> Iterator[None]:
+        """Context within which the caches of a scope are valid.
+
+        The caches in the scope are emptied on entry and on exit.
+        """
+        self.invalidate(scope)
+        try:
+            yield
+        finally:
+            self.invalidate(scope)
+
+    def stats(self) -> dict[str, CacheStats]:
+        """Usage counters for each cache."""
+        return {name: cache.stats for name, cache in self.caches.items()}
+
+    def reset_stats(self) -> None:
+        """Reset the hit, miss, and eviction counters of every cache."""
+        for cache in self.caches.values():
+            cache.stats.hits = cache.stats.misses = cache.stats.evictions = 0
+
+    def __str__(self) -> str:
+        return "\n".join(str(c) for c in self.caches.values() if c.stats.misses > 0)
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+registry = CacheRegistry()
+memoize = registry.memoize
@@ -1,6 +1,7 @@
 """Advent of Code 2022 data."""
 
 import os
+from collections.abc import Iterator
 from pathlib import Path
 
 
@@ -18,3 +19,15 @@ def puzzle_input_file(day: int, filename: str | None = None) -> Path:
 def read_input_to_string(day: int, filename: str | None = None) -> str:
     """Read input data file as a string."""
     return puzzle_input_file(day=day, filename=filename).read_text()
+
+
+def read_input_to_bytes(day: int, filename: str | None = None) -> bytes:
+    """Read input data file as raw bytes."""
+    return puzzle_input_file(day=day, filename=filename).read_bytes()
+
+
+def iter_input_lines(day: int, filename: str | None = None) -> Iterator[str]:
+    """Lazily read the lines of the input data file (without line endings)."""
+    with open(puzzle_input_file(day=day, filename=filename)) as file:
+        for line in file:
+            yield line.rstrip("\r\n")
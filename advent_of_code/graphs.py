@@ -0,0 +1,299 @@
+"""Array-based graph search algorithms.
+
+Graphs are stored in compressed sparse row (CSR) form over integer node indices so
+that the searches avoid the per-node object overhead of `networkx`.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from dataclasses import dataclass, field
+
+import networkx as nx
+import numpy as np
+import numpy.typing as npt
+
+from advent_of_code.metrics import counter
+
+IntArray = npt.NDArray[np.int64]
+FloatArray = npt.NDArray[np.float64]
+
+_bfs_expansions = counter("aoc_graph_bfs_expansions_total", "Nodes expanded by BFS.")
+
+
+@dataclass(frozen=True)
+class CSRGraph:
+    """Directed graph in compressed sparse row form.
+
+    The successors of node `i` are `indices[indptr[i] : indptr[i + 1]]` with the
+    matching edge weights in `weights` (or `1` for every edge if `weights` is
+    `None`).
+    """
+
+    indptr: IntArray
+    indices: IntArray
+    weights: FloatArray | None = None
+    labels: list[Hashable] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        assert self.indptr.ndim == 1 and self.indptr[0] == 0
+        assert self.indptr[-1] == len(self.indices)
+        if self.weights is not None:
+            assert len(self.weights) == len(self.indices)
+        if self.labels:
+            assert len(self.labels) == self.n_nodes
+
+    def __str__(self) -> str:
+        return f"CSRGraph ({self.n_nodes} nodes, {self.n_edges} edges)"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    @property
+    def n_nodes(self) -> int:
+        """Number of nodes in the graph."""
+        return len(self.indptr) - 1
+
+    @property
+    def n_edges(self) -> int:
+        """Number of edges in the graph."""
+        return len(self.indices)
+
+    def node_index(self, label: Hashable) -> int:
+        """Index of a node given its label."""
+        return self.labels.index(label)
+
+    def neighbors(self, node: int) -> IntArray:
+        """Successors of a node."""
+        return self.indices[self.indptr[node] : self.indptr[node + 1]]
+
+    def reverse(self) -> CSRGraph:
+        """Graph with the direction of every edge reversed."""
+        sources = np.repeat(np.arange(self.n_nodes), np.diff(self.indptr))
+        return from_edges(
+            self.n_nodes,
+            sources=self.indices,
+            targets=sources,
+            weights=self.weights,
+            labels=self.labels,
+        )
+
+
+def from_edges(
+    n_nodes: int,
+    sources: Sequence[int] | IntArray,
+    targets: Sequence[int] | IntArray,
+    weights: Sequence[float] | FloatArray | None = None,
+    labels: list[Hashable] | None = None,
+) -> CSRGraph:
+    """Build a CSR graph from parallel arrays of edge sources and targets.
+
+    Args:
+        n_nodes (int): Number of nodes in the graph.
+        sources (Sequence[int] | IntArray): Source node of each edge.
+        targets (Sequence[int] | IntArray): Target node of each edge.
+        weights (Sequence[float] | FloatArray | None, optional): Weight of each edge.
+        Defaults to `None` for an unweighted graph.
+        labels (list[Hashable] | None, optional): Label of each node. Defaults to
+        `None`.
+
+    Returns:
+        CSRGraph: Graph in CSR form.
+    """
+    src = np.asarray(sources, dtype=np.int64)
+    tgt = np.asarray(targets, dtype=np.int64)
+    assert src.shape == tgt.shape
+    order = np.argsort(src, kind="stable")
+    counts = np.bincount(src, minlength=n_nodes)
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    w: FloatArray | None = None
+    if weights is not None:
+        w = np.asarray(weights, dtype=np.float64)[order]
+    return CSRGraph(
+        indptr=indptr, indices=tgt[order], weights=w, labels=list(labels or [])
+    )
+
+
+def from_networkx(gr: nx.Graph, weight: str | None = None) -> CSRGraph:
+    """Convert a `networkx` graph into a CSR graph.
+
+    Node labels are kept in the order of `gr.nodes`. Parallel edges of multigraphs
+    are collapsed into a single edge with the minimum weight and undirected graphs
+    gain an edge in each direction.
+
+    Args:
+        gr (nx.Graph): Graph to convert.
+        weight (str | None, optional): Edge attribute to use for weights. Defaults
+        to `None` for an unweighted graph.
+
+    Returns:
+        CSRGraph: Graph in CSR form.
+    """
+    labels: list[Hashable] = list(gr.nodes)
+    index = {label: i for i, label in enumerate(labels)}
+    edges: dict[tuple[int, int], float] = {}
+    for u, v, data in gr.edges(data=True):
+        w = 1.0 if weight is None else float(data.get(weight, 1.0))
+        pairs = [(index[u], index[v])]
+        if not gr.is_directed():
+            pairs.append((index[v], index[u]))
+        for pair in pairs:
+            edges[pair] = min(w, edges.get(pair, w))
+    sources = [u for u, _ in edges]
+    targets = [v for _, v in edges]
+    weights = list(edges.values()) if weight is not None else None
+    return from_edges(len(labels), sources, targets, weights=weights, labels=labels)
+
+
+def _gather_neighbors(graph: CSRGraph, frontier: IntArray) -> IntArray:
+    starts = graph.indptr[frontier]
+    counts = graph.indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return graph.indices[offsets + np.arange(total)]
+
+
+def multi_source_bfs(
+    graph: CSRGraph, sources: Iterable[int], target: int | None = None
+) -> IntArray:
+    """Unweighted shortest path lengths from the closest of many sources.
+
+    The search is level-synchronous so each level is expanded with array
+    operations rather than per-node Python calls.
+
+    Args:
+        graph (CSRGraph): Graph to search.
+        sources (Iterable[int]): Starting nodes (all at distance 0).
+        target (int | None, optional): Stop once this node is reached. Defaults to
+        `None` to search the entire graph.
+
+    Returns:
+        IntArray: Distance to each node or -1 if the node was not reached.
+    """
+    dist = np.full(graph.n_nodes, -1, dtype=np.int64)
+    frontier = np.unique(np.fromiter(sources, dtype=np.int64))
+    dist[frontier] = 0
+    level = 0
+    while frontier.size > 0:
+        if target is not None and dist[target] >= 0:
+            break
+        level += 1
+        _bfs_expansions.inc(frontier.size)
+        nbrs = _gather_neighbors(graph, frontier)
+        frontier = np.unique(nbrs[dist[nbrs] < 0])
+        dist[frontier] = level
+    return dist
+
+
+def bfs(graph: CSRGraph, source: int, target: int | None = None) -> IntArray:
+    """Unweighted shortest path lengths from a single source.
+
+    Args:
+        graph (CSRGraph): Graph to search.
+        source (int): Starting node.
+        target (int | None, optional): Stop once this node is reached. Defaults to
+        `None` to search the entire graph.
+
+    Returns:
+        IntArray: Distance to each node or -1 if the node was not reached.
+    """
+    return multi_source_bfs(graph, [source], target=target)
+
+
+def _edge_weights(graph: CSRGraph) -> list[float]:
+    if graph.weights is None:
+        return [1.0] * graph.n_edges
+    assert np.all(graph.weights >= 0), "Negative edge weights are not supported."
+    return graph.weights.tolist()
+
+
+def dijkstra(graph: CSRGraph, source: int, target: int | None = None) -> FloatArray:
+    """Weighted shortest path lengths from a single source.
+
+    Args:
+        graph (CSRGraph): Graph to search (weights must be non-negative).
+        source (int): Starting node.
+        target (int | None, optional): Stop once this node is settled. Defaults to
+        `None` to search the entire graph.
+
+    Returns:
+        FloatArray: Distance to each node or `inf` if the node was not reached.
+    """
+    indptr, indices = graph.indptr.tolist(), graph.indices.tolist()
+    weights = _edge_weights(graph)
+    dist = [np.inf] * graph.n_nodes
+    dist[source] = 0.0
+    queue: list[tuple[float, int]] = [(0.0, source)]
+    while queue:
+        d, u = heapq.heappop(queue)
+        if d > dist[u]:
+            continue
+        if u == target:
+            break
+        for e in range(indptr[u], indptr[u + 1]):
+            v, nd = indices[e], d + weights[e]
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(queue, (nd, v))
+    return np.array(dist, dtype=np.float64)
+
+
+def astar(
+    graph: CSRGraph, source: int, target: int, heuristic: Callable[[int], float]
+) -> float:
+    """Weighted shortest path length between two nodes using A* search.
+
+    Args:
+        graph (CSRGraph): Graph to search (weights must be non-negative).
+        source (int): Starting node.
+        target (int): Goal node.
+        heuristic (Callable[[int], float]): Admissible estimate of the distance
+        from a node to the target.
+
+    Returns:
+        float: Length of the shortest path or `inf` if there is no path.
+    """
+    indptr, indices = graph.indptr.tolist(), graph.indices.tolist()
+    weights = _edge_weights(graph)
+    dist: dict[int, float] = {source: 0.0}
+    queue: list[tuple[float, float, int]] = [(heuristic(source), 0.0, source)]
+    while queue:
+        _, d, u = heapq.heappop(queue)
+        if u == target:
+            return d
+        if d > dist[u]:
+            continue
+        for e in range(indptr[u], indptr[u + 1]):
+            v, nd = indices[e], d + weights[e]
+            if nd < dist.get(v, np.inf):
+                dist[v] = nd
+                heapq.heappush(queue, (nd + heuristic(v), nd, v))
+    return np.inf
+
+
+def all_pairs_shortest_paths(graph: CSRGraph) -> FloatArray:
+    """Shortest path lengths between every pair of nodes.
+
+    Uses the Floyd-Warshall algorithm with each relaxation step applied to the
+    whole distance matrix at once, so it is best suited to small, dense graphs.
+
+    Args:
+        graph (CSRGraph): Graph to search.
+
+    Returns:
+        FloatArray: Matrix where entry `[i, j]` is the distance from `i` to `j` or
+        `inf` if there is no path.
+    """
+    n = graph.n_nodes
+    dist = np.full((n, n), np.inf)
+    sources = np.repeat(np.arange(n), np.diff(graph.indptr))
+    weights = np.ones(graph.n_edges) if graph.weights is None else graph.weights
+    np.minimum.at(dist, (sources, graph.indices), weights)
+    np.fill_diagonal(dist, 0.0)
+    for k in range(n):
+        np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+    return dist
@@ -0,0 +1,77 @@
+"""Operation counters for the puzzles' hot paths.
+
+Counters are cheap to increment so hot loops should tally work in a local variable
+and add it to the counter once per call rather than once per iteration.
+"""
+
+import json
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+
+
+@dataclass
+class Counter:
+    """Monotonically increasing count of some unit of work."""
+
+    name: str
+    help: str = ""
+    value: int = 0
+
+    def inc(self, n: int = 1) -> None:
+        """Increment the counter."""
+        self.value += n
+
+
+class MetricsFormat(str, Enum):
+    """Export format for metrics."""
+
+    PROMETHEUS = "prometheus"
+    JSON = "json"
+
+
+class MetricsRegistry:
+    """Collection of all of the counters."""
+
+    def __init__(self) -> None:
+        self.counters: dict[str, Counter] = {}
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        """Get a counter by name, creating it if it does not yet exist."""
+        if name not in self.counters:
+            self.counters[name] = Counter(name=name, help=help)
+        return self.counters[name]
+
+    def reset(self) -> None:
+        """Set every counter back to zero."""
+        for c in self.counters.values():
+            c.value = 0
+
+    def to_prometheus(self) -> str:
+        """Export the counters in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for c in sorted(self.counters.values(), key=lambda c: c.name):
+            if c.help:
+                lines.append(f"# HELP {c.name} {c.help}")
+            lines.append(f"# TYPE {c.name} counter")
+            lines.append(f"{c.name} {c.value}")
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> str:
+        """Export the counters as a JSON object."""
+        data = {
+            c.name: {"type": "counter", "help": c.help, "value": c.value}
+            for c in sorted(self.counters.values(), key=lambda c: c.name)
+        }
+        return json.dumps(data, indent=2)
+
+    def export(self, path: Path, fmt: MetricsFormat) -> None:
+        """Write the counters to a file."""
+        if fmt is MetricsFormat.JSON:
+            path.write_text(self.to_json() + "\n")
+        else:
+            path.write_text(self.to_prometheus())
+
+
+registry = MetricsRegistry()
+counter = registry.counter
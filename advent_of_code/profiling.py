@@ -0,0 +1,115 @@
+"""Low-overhead sampling profiler.
+
+A background thread periodically captures the stack of the profiled thread and
+tallies the samples as collapsed stacks (one `frame;frame;frame count` line per
+distinct stack) that can be fed directly to flame graph tools. Unlike
+deterministic profiling, the profiled code runs unmodified between samples so deep
+recursion and tight loops are not distorted.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType, TracebackType
+
+
+def _frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}:{code.co_name}"
+
+
+def _collapse_stack(frame: FrameType | None) -> str:
+    names: list[str] = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+class SamplingProfiler:
+    """Sample the stack of a thread at a fixed rate."""
+
+    def __init__(self, rate: float = 100.0, thread_id: int | None = None) -> None:
+        """Create a sampling profiler.
+
+        Args:
+            rate (float, optional): Samples per second. Defaults to 100.
+            thread_id (int | None, optional): Identifier of the thread to sample.
+            Defaults to `None` for the thread that starts the profiler.
+        """
+        assert rate > 0, "Sampling rate must be positive."
+        self.interval = 1.0 / rate
+        self.thread_id = thread_id
+        self.samples: Counter[str] = Counter()
+        self.sampling_time: float = 0.0
+        self.elapsed_time: float = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._start_time: float = 0.0
+
+    def __enter__(self) -> SamplingProfiler:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    @property
+    def n_samples(self) -> int:
+        """Number of samples collected."""
+        return sum(self.samples.values())
+
+    @property
+    def overhead(self) -> float:
+        """Fraction of the profiled wall time spent taking samples."""
+        if self.elapsed_time == 0:
+            return 0.0
+        return self.sampling_time / self.elapsed_time
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        assert self._thread is None, "Profiler already started."
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._start_time = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._sample_loop, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.elapsed_time += time.perf_counter() - self._start_time
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            t0 = time.perf_counter()
+            frame = sys._current_frames().get(self.thread_id or -1)
+            if frame is not None:
+                self.samples[_collapse_stack(frame)] += 1
+            del frame
+            self.sampling_time += time.perf_counter() - t0
+
+    def collapsed(self) -> str:
+        """Samples in collapsed stack format, most frequent first."""
+        return "".join(f"{s} {n}\n" for s, n in self.samples.most_common())
+
+    def write(self, path: Path) -> None:
+        """Write the samples to a file in collapsed stack format."""
+        path.write_text(self.collapsed())
@@ -1,10 +1,31 @@
 """Advent of Code 2022 – Day 1. Calorie Counting."""
 
-from typing import Final
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from itertools import chain, repeat
+from pathlib import Path
+from typing import BinaryIO, Final
+
+import numpy as np
+import numpy.typing as npt
 
 from advent_of_code.checks import check_result
 from advent_of_code.cli_helpers import print_results
-from advent_of_code.data import read_input_to_string
+from advent_of_code.data import (
+    iter_input_lines,
+    puzzle_input_file,
+    read_input_to_bytes,
+    read_input_to_string,
+)
 
 DAY: Final[int] = 1
 TITLE: Final[str] = "Calorie Counting"
@@ -42,6 +63,79 @@ class ElfCalorie:
         return str(self)
 
 
+class ElfCalorieStore:
+    """Columnar elf calories data.
+
+    All of the calorie values are held in one flat array with the values of elf
+    `i` at `values[offsets[i] : offsets[i + 1]]`. The totals are sorted once (on
+    the first query after new elves are added) so that rank, percentile, top-k,
+    and histogram queries are binary searches.
+    """
+
+    def __init__(self) -> None:
+        self.values = array("q")
+        self.offsets = array("q", [0])
+        self.totals = array("q")
+        self._sorted_totals: array[int] | None = None
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> ElfCalorieStore:
+        """Build the store by streaming lines of the raw input."""
+        store = cls()
+        for x in lines:
+            x = x.strip()
+            if x == "":
+                store._close_elf()
+            else:
+                store.values.append(int(x))
+        store._close_elf()
+        return store
+
+    def _close_elf(self) -> None:
+        start = self.offsets[-1]
+        if len(self.values) > start:
+            self.offsets.append(len(self.values))
+            self.totals.append(sum(self.values[start:]))
+            self._sorted_totals = None
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def __str__(self) -> str:
+        return f"Elf Calorie Store: {len(self)} elves, {len(self.values)} values"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def elf_values(self, elf: int) -> array[int]:
+        """Calorie values of a single elf."""
+        return self.values[self.offsets[elf] : self.offsets[elf + 1]]
+
+    @property
+    def sorted_totals(self) -> array[int]:
+        """Totals in ascending order."""
+        if self._sorted_totals is None:
+            self._sorted_totals = array("q", sorted(self.totals))
+        return self._sorted_totals
+
+    def rank(self, elf: int) -> int:
+        """Rank of an elf by total calories (1 is the most; ties share a rank)."""
+        return len(self) - bisect_right(self.sorted_totals, self.totals[elf]) + 1
+
+    def percentile(self, elf: int) -> float:
+        """Percentage of elves with the same or fewer total calories as an elf."""
+        return 100 * bisect_right(self.sorted_totals, self.totals[elf]) / len(self)
+
+    def top_k(self, k: int) -> list[int]:
+        """Largest `k` calorie totals in descending order."""
+        return self.sorted_totals[-k:].tolist()[::-1] if k > 0 else []
+
+    def histogram(self, bin_edges: Sequence[int]) -> list[int]:
+        """Number of elves with totals in each bin `[bin_edges[i], bin_edges[i+1])`."""
+        idx = [bisect_left(self.sorted_totals, edge) for edge in bin_edges]
+        return [b - a for a, b in zip(idx[:-1], idx[1:])]
+
+
 def parse_elf_calorie_input(data: str) -> list[ElfCalorie]:
     """Parse elf calories input data.
 
@@ -69,6 +163,260 @@ def parse_elf_calorie_input(data: str) -> list[ElfCalorie]:
     return elves
 
 
+def iter_elf_totals(lines: Iterable[str]) -> Iterator[int]:
+    """Stream the total calories of each elf from lines of input data.
+
+    Only the running total of the current elf is held in memory.
+
+    Args:
+        lines (Iterable[str]): Lines of the raw input.
+
+    Yields:
+        int: Total calories of each elf in order.
+    """
+    total: int | None = None
+    for x in lines:
+        x = x.strip()
+        if x == "":
+            if total is not None:
+                yield total
+                total = None
+        else:
+            total = int(x) + (total or 0)
+    if total is not None:
+        yield total
+
+
+def top_k_calories(totals: Iterable[int], k: int) -> list[int]:
+    """Find the largest `k` calorie totals in O(n log k) time and O(k) memory.
+
+    Args:
+        totals (Iterable[int]): Total calories of each elf.
+        k (int): Number of top totals to keep.
+
+    Returns:
+        list[int]: The top `k` totals in descending order.
+    """
+    assert k > 0, "Must keep at least one total."
+    heap: list[int] = []
+    for total in totals:
+        if len(heap) < k:
+            heapq.heappush(heap, total)
+        elif total > heap[0]:
+            heapq.heapreplace(heap, total)
+    return sorted(heap, reverse=True)
+
+
+def elf_totals_from_bytes(data: bytes) -> npt.NDArray[np.int64]:
+    """Vectorized parsing of raw input data into the total calories of each elf.
+
+    Each digit is weighted by its place value within its line so that one
+    segmented sum over the bytes gives the value of each line and a second
+    segmented sum over the lines gives the total of each elf.
+
+    Args:
+        data (bytes): Raw input data.
+
+    Returns:
+        npt.NDArray[np.int64]: Total calories of each elf in order.
+    """
+    buf = np.frombuffer(data + b"\n", dtype=np.uint8)
+    is_newline = buf == ord("\n")
+    line_ends = np.flatnonzero(is_newline)
+    line_starts = np.concatenate([[0], line_ends[:-1] + 1])
+    line_ids = np.cumsum(is_newline) - is_newline
+
+    # Span of the digits in each line (lines without digits are blank).
+    is_digit = (buf >= ord("0")) & (buf <= ord("9"))
+    pos = np.arange(len(buf))
+    first_digit = np.minimum.reduceat(np.where(is_digit, pos, len(buf)), line_starts)
+    last_digit = np.maximum.reduceat(np.where(is_digit, pos, -1), line_starts)
+    n_digits = np.add.reduceat(is_digit.astype(np.int64), line_starts)
+    is_blank = n_digits == 0
+    assert np.all(
+        is_blank | (last_digit - first_digit + 1 == n_digits)
+    ), "Expected at most one number per line."
+
+    # Place value of each digit from the end of the digits in its line.
+    exponent = last_digit[line_ids] - pos
+    place_values = np.where(is_digit, 10 ** np.maximum(exponent, 0), 0)
+    digits = np.where(is_digit, buf.astype(np.int64) - ord("0"), 0)
+
+    # Value of each non-blank line and the elf (group of lines) it belongs to.
+    value_lines = np.flatnonzero(~is_blank)
+    if len(value_lines) == 0:
+        return np.zeros(0, dtype=np.int64)
+    values = np.add.reduceat(digits * place_values, line_starts)[value_lines]
+    elf_ids = np.cumsum(is_blank)[value_lines]
+    elf_starts = np.flatnonzero(np.diff(elf_ids, prepend=-1) != 0)
+    return np.add.reduceat(values, elf_starts)
+
+
+def top_k_calories_array(totals: npt.NDArray[np.int64], k: int) -> list[int]:
+    """Find the largest `k` calorie totals with a partial sort.
+
+    Args:
+        totals (npt.NDArray[np.int64]): Total calories of each elf.
+        k (int): Number of top totals to keep.
+
+    Returns:
+        list[int]: The top `k` totals in descending order.
+    """
+    assert k > 0, "Must keep at least one total."
+    k = min(k, len(totals))
+    if k == 0:
+        return []
+    top = np.partition(totals, len(totals) - k)[len(totals) - k :]
+    return sorted(top.tolist(), reverse=True)
+
+
+_blank_line = re.compile(rb"\n\r?\n")
+
+
+def _next_group_start(file: BinaryIO, offset: int, window: int = 2**16) -> int:
+    # Start one byte early so a blank line straddling `offset` is found.
+    pos = max(offset - 1, 0)
+    file.seek(pos)
+    carry = b""
+    while block := file.read(window):
+        data = carry + block
+        if (m := _blank_line.search(data)) is not None:
+            return pos - len(carry) + m.end()
+        carry = data[-2:]
+        pos += len(block)
+    return pos
+
+
+def split_at_group_boundaries(path: Path, n_chunks: int) -> list[tuple[int, int]]:
+    """Split a file into byte ranges that each start at the beginning of an elf.
+
+    The file is divided into roughly equal ranges and each split point is moved
+    forward to just after the next blank line so that no elf's group of lines is
+    divided between ranges.
+
+    Args:
+        path (Path): Input data file.
+        n_chunks (int): Target number of ranges.
+
+    Returns:
+        list[tuple[int, int]]: Start (inclusive) and end (exclusive) byte offsets.
+    """
+    size = path.stat().st_size
+    bounds = [0]
+    with open(path, "rb") as file:
+        for i in range(1, n_chunks):
+            offset = max(size * i // n_chunks, bounds[-1])
+            if bounds[-1] < (b := _next_group_start(file, offset)) < size:
+                bounds.append(b)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _chunk_top_k_calories(path: Path, chunk: tuple[int, int], k: int) -> list[int]:
+    with open(path, "rb") as file:
+        file.seek(chunk[0])
+        data = file.read(chunk[1] - chunk[0])
+    return top_k_calories_array(elf_totals_from_bytes(data), k=k)
+
+
+def parallel_top_k_calories(
+    path: Path, k: int, workers: int | None = None, chunk_bytes: int = 2**26
+) -> list[int]:
+    """Find the largest `k` calorie totals of a file using multiple processes.
+
+    The file is split into ranges at elf boundaries, each worker finds the top `k`
+    of its ranges with the vectorized engine, and the results are merged.
+
+    Args:
+        path (Path): Input data file.
+        k (int): Number of top totals to keep.
+        workers (int | None, optional): Number of worker processes. Defaults to
+        `None` for the number of CPUs.
+        chunk_bytes (int, optional): Approximate size of each range, bounding the
+        memory used by each worker. Defaults to 64 MiB.
+
+    Returns:
+        list[int]: The top `k` totals in descending order.
+    """
+    workers = workers or os.cpu_count() or 1
+    n_chunks = max(workers, -(-path.stat().st_size // chunk_bytes))
+    chunks = split_at_group_boundaries(path, n_chunks=n_chunks)
+    with ProcessPoolExecutor(workers) as pool:
+        chunk_tops = pool.map(_chunk_top_k_calories, repeat(path), chunks, repeat(k))
+        return top_k_calories(chain.from_iterable(chunk_tops), k=k)
+
+
+@dataclass
+class IncrementalCalorieState:
+    """Persistable top-k state for an input file that grows by appending.
+
+    Only the bytes after `offset` are read on each update, so the work is
+    proportional to the amount of new data. A trailing line that does not yet end
+    in a newline is not consumed (it may still be appended to) but its value is
+    included provisionally in the answers.
+    """
+
+    k: int = 3
+    offset: int = 0
+    current_total: int | None = None
+    pending_line: str = ""
+    heap: list[int] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Path, k: int = 3) -> IncrementalCalorieState:
+        """Load the state from a JSON file (new state if the file does not exist)."""
+        if not path.exists():
+            return cls(k=k)
+        state = cls(**json.loads(path.read_text()))
+        assert state.k == k, f"Saved state is for top-{state.k}, not top-{k}."
+        return state
+
+    def save(self, path: Path) -> None:
+        """Save the state to a JSON file."""
+        path.write_text(json.dumps(asdict(self)) + "\n")
+
+    def _close_elf(self) -> None:
+        if self.current_total is None:
+            return
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, self.current_total)
+        elif self.current_total > self.heap[0]:
+            heapq.heapreplace(self.heap, self.current_total)
+        self.current_total = None
+
+    def process(self, data: bytes) -> None:
+        """Process the input data from `offset` onwards.
+
+        Args:
+            data (bytes): Input data starting at byte `offset` of the input.
+        """
+        complete, newline, pending = data.rpartition(b"\n")
+        for line in complete.decode().split("\n") if newline else []:
+            line = line.strip()
+            if line == "":
+                self._close_elf()
+            else:
+                self.current_total = int(line) + (self.current_total or 0)
+        self.offset += len(complete) + len(newline)
+        self.pending_line = pending.decode()
+
+    def update(self, path: Path) -> None:
+        """Process the data appended to an input file since the last update."""
+        with open(path, "rb") as file:
+            file.seek(self.offset)
+            self.process(file.read())
+
+    def top_k(self) -> list[int]:
+        """Largest `k` calorie totals in descending order."""
+        totals = list(self.heap)
+        current = self.current_total
+        if (pending := self.pending_line.strip()) != "":
+            current = int(pending) + (current or 0)
+        if current is not None:
+            totals.append(current)
+        return heapq.nlargest(self.k, totals)
+
+
 def puzzle_1(elf_cals: list[ElfCalorie]) -> int:
     """Puzzle 1.
 
@@ -91,8 +439,7 @@ def puzzle_2(elf_cals: list[ElfCalorie]) -> int:
     Returns:
         int: Sum of the top three total calorie values.
     """
-    cals = sorted([elf.total for elf in elf_cals])
-    return sum(cals[-3:])
+    return sum(top_k_calories((elf.total for elf in elf_cals), k=3))
 
 
 def main() -> None:
@@ -112,8 +459,55 @@ def main() -> None:
     res2 = puzzle_2(elf_cals=elf_calories)
     check_result(198041, res2)
 
+    # Streaming engine.
+    top_3 = top_k_calories(iter_elf_totals(iter_input_lines(DAY)), k=3)
+    check_result(res1, top_3[0])
+    check_result(res2, sum(top_3))
+
+    # Vectorized engine.
+    ex_top_3 = top_k_calories_array(elf_totals_from_bytes(ex_input.encode()), k=3)
+    check_result([24000, 11000, 10000], ex_top_3)
+    top_3 = top_k_calories_array(elf_totals_from_bytes(read_input_to_bytes(DAY)), k=3)
+    check_result(res1, top_3[0])
+    check_result(res2, sum(top_3))
+
+    # Incremental engine (with the example appended to in two parts).
+    ex_state = IncrementalCalorieState(k=3)
+    ex_data = ex_input.encode()
+    ex_state.process(ex_data[:40])
+    ex_state.process(ex_data[ex_state.offset :])
+    check_result([24000, 11000, 10000], ex_state.top_k())
+    state = IncrementalCalorieState(k=3)
+    state.update(puzzle_input_file(DAY))
+    check_result(res1, state.top_k()[0])
+    check_result(res2, sum(state.top_k()))
+
+    # Columnar store.
+    ex_store = ElfCalorieStore.from_lines(ex_input.splitlines())
+    check_result([24000, 11000, 10000], ex_store.top_k(3))
+    check_result(1, ex_store.rank(3))
+    check_result([1, 2, 2], ex_store.histogram([0, 5000, 11000, 25000]))
+    store = ElfCalorieStore.from_lines(iter_input_lines(DAY))
+    check_result(res1, store.top_k(1)[0])
+    check_result(res2, sum(store.top_k(3)))
+
     print_results(DAY, TITLE, result1=res1, result2=res2)
 
 
+def check_parallel_engine() -> None:
+    """Check the parallel engine against the vectorized engine.
+
+    Kept out of `main()` as starting a process pool costs far more than solving
+    the puzzle input (and `main()` may itself run in a pool worker).
+    """
+    expected = top_k_calories_array(elf_totals_from_bytes(read_input_to_bytes(DAY)), 3)
+    # Small chunks to split the input many times.
+    top_3 = parallel_top_k_calories(
+        puzzle_input_file(DAY), k=3, workers=2, chunk_bytes=2**10
+    )
+    check_result(expected, top_3)
+
+
 if __name__ == "__main__":
     main()
+    check_parallel_engine()
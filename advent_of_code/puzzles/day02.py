@@ -1,11 +1,25 @@
 """Advent of Code 2022 – Day 2. Rock Paper Scissors."""
 
+import mmap
+import os
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from enum import Enum
-from typing import Final
+from itertools import permutations, repeat
+from pathlib import Path
+from typing import Final, TypeVar
+
+import numpy as np
+import numpy.typing as npt
 
 from advent_of_code.checks import check_result
 from advent_of_code.cli_helpers import print_results
-from advent_of_code.data import read_input_to_string
+from advent_of_code.data import (
+    puzzle_input_file,
+    read_input_to_bytes,
+    read_input_to_string,
+)
 
 DAY: Final[int] = 2
 TITLE: Final[str] = "Rock Paper Scissors"
@@ -40,6 +54,52 @@ class RPSResult(str, Enum):
     WIN = "WIN"
 
 
+IntArray = npt.NDArray[np.int64]
+Choices = TypeVar("Choices", int, IntArray)
+
+
+@dataclass(frozen=True)
+class CyclicGame:
+    """Generalized Rock-Paper-Scissors with an odd number of choices.
+
+    Choices are encoded as integers `0, ..., n - 1` and outcomes (for the second
+    player) as -1 (loss), 0 (draw), and 1 (win). Choice `b` beats choice `a` if
+    `(b - a) mod n` is odd so each choice beats exactly half of the others. The
+    methods work on integers or elementwise on arrays of choices.
+    """
+
+    n_choices: int = 3
+    outcome_points: tuple[int, int, int] = (0, 3, 6)
+
+    def __post_init__(self) -> None:
+        assert self.n_choices >= 3 and self.n_choices % 2 == 1
+
+    def outcome(self, a: Choices, b: Choices) -> Choices:
+        """Outcome for the second player of choices `a` and `b`."""
+        d = (b - a) % self.n_choices
+        return (d != 0) * (1 - 2 * ((d + 1) % 2))
+
+    def choice_for_outcome(self, a: Choices, outcome: Choices) -> Choices:
+        """Choice against `a` that results in the desired outcome."""
+        return (a + outcome) % self.n_choices
+
+    def score(self, a: Choices, b: Choices) -> Choices:
+        """Points for the second player (outcome points plus choice `b` + 1)."""
+        return np.take(self.outcome_points, self.outcome(a, b) + 1) + b + 1
+
+
+ROCK_PAPER_SCISSORS: Final[CyclicGame] = CyclicGame(n_choices=3)
+
+_rps_choices: Final[str] = "ABC"
+_rps_outcomes: Final[dict[int, RPSResult]] = {
+    -1: RPSResult.LOSS,
+    0: RPSResult.DRAW,
+    1: RPSResult.WIN,
+}
+_rps_outcome_values: Final[dict[RPSResult, int]] = {
+    v: k for k, v in _rps_outcomes.items()
+}
+
 rps_choice_conversion_table: Final[dict[str, str]] = {"X": "A", "Y": "B", "Z": "C"}
 
 
@@ -50,32 +110,12 @@ def play_round_of_rps(a: str, b: str) -> RPSResult:
         a (str): Opponents choice.
         b (str): My choice.
 
-    Raises:
-        BaseException: Raised if no result found.
-
     Returns:
         RPSResult: Result of the round of the game.
     """
     b = rps_choice_conversion_table[b]
-    if a == b:
-        return RPSResult.DRAW
-    if a == "A":
-        if b == "B":
-            return RPSResult.WIN
-        else:
-            return RPSResult.LOSS
-    elif a == "B":
-        if b == "C":
-            return RPSResult.WIN
-        else:
-            return RPSResult.LOSS
-    elif a == "C":
-        if b == "A":
-            return RPSResult.WIN
-        else:
-            return RPSResult.LOSS
-    else:
-        raise BaseException("Should not reach this point.")
+    res = ROCK_PAPER_SCISSORS.outcome(_rps_choices.index(a), _rps_choices.index(b))
+    return _rps_outcomes[int(res)]
 
 
 game_result_points: Final[dict[RPSResult, int]] = {
@@ -89,13 +129,16 @@ choice_played_points_xyz: Final[dict[str, int]] = {"X": 1, "Y": 2, "Z": 3}
 choice_played_points_abc: Final[dict[str, int]] = {"A": 1, "B": 2, "C": 3}
 
 
+def score_round_1(a: str, b: str) -> int:
+    """Points for a round where `b` is my choice."""
+    return game_result_points[play_round_of_rps(a, b)] + choice_played_points_xyz[b]
+
+
 def puzzle_1(strategy: GameStrategy) -> int:
     """Puzzle 1."""
     total_points: int = 0
     for a, b in strategy:
-        result = play_round_of_rps(a, b)
-        points = game_result_points[result] + choice_played_points_xyz[b]
-        total_points += points
+        total_points += score_round_1(a, b)
     return total_points
 
 
@@ -113,45 +156,201 @@ def get_choice_to_win(a: str, outcome: RPSResult) -> str:
         a (str): Choice of opponent.
         outcome (RPSResult): Desired result of the round.
 
-    Raises:
-        BaseException: Raised if no solution found.
-
     Returns:
         str: Choice I should make.
     """
-    if outcome is RPSResult.DRAW:
-        return a
-
-    if a == "A":
-        if outcome is RPSResult.WIN:
-            return "B"
-        else:
-            return "C"
-    elif a == "B":
-        if outcome is RPSResult.WIN:
-            return "C"
-        else:
-            return "A"
-    elif a == "C":
-        if outcome is RPSResult.WIN:
-            return "A"
-        else:
-            return "B"
-    else:
-        raise BaseException("Should not reach this point.")
+    res = _rps_outcome_values[outcome]
+    choice = ROCK_PAPER_SCISSORS.choice_for_outcome(_rps_choices.index(a), res)
+    return _rps_choices[int(choice)]
+
+
+def score_round_2(a: str, b: str) -> int:
+    """Points for a round where `b` is the desired outcome."""
+    result = desired_outcome_table[b]
+    choice = get_choice_to_win(a, result)
+    return game_result_points[result] + choice_played_points_abc[choice]
 
 
 def puzzle_2(strategy: GameStrategy) -> int:
     """Puzzle 2."""
     total_points: int = 0
     for a, b in strategy:
-        result = desired_outcome_table[b]
-        choice = get_choice_to_win(a, result)
-        points = game_result_points[result] + choice_played_points_abc[choice]
-        total_points += points
+        total_points += score_round_2(a, b)
     return total_points
 
 
+# Line-type histograms are indexed as [opponent choice (ABC), second column (XYZ)].
+LineTypeCounts = npt.NDArray[np.int64]
+ScoreTable = npt.NDArray[np.int64]
+
+
+def make_score_table(score_round: Callable[[str, str], int]) -> ScoreTable:
+    """Precompute the points for each of the 9 possible line types."""
+    return np.array([[score_round(a, b) for b in "XYZ"] for a in "ABC"])
+
+
+PUZZLE_1_SCORES: Final[ScoreTable] = make_score_table(score_round_1)
+PUZZLE_2_SCORES: Final[ScoreTable] = make_score_table(score_round_2)
+
+
+def _letter_codes(alphabet: str) -> IntArray:
+    codes = np.full(256, -1, dtype=np.int64)
+    codes[[ord(c) for c in alphabet]] = np.arange(len(alphabet))
+    return codes
+
+
+def encode_strategy(
+    data: bytes | memoryview, alphabets: tuple[str, str] = ("ABC", "XYZ")
+) -> tuple[IntArray, IntArray]:
+    """Encode the two columns of raw strategy guide bytes as integer arrays.
+
+    Each non-blank line must have exactly two single-letter columns separated by
+    whitespace. The letters of each column are encoded by their position in that
+    column's alphabet so the alphabets may overlap.
+
+    Args:
+        data (bytes | memoryview): Raw strategy guide data.
+        alphabets (tuple[str, str], optional): Letters of the choices in the first
+        and second columns. Defaults to ("ABC", "XYZ").
+
+    Returns:
+        tuple[IntArray, IntArray]: Encoded first and second columns.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    is_newline = buf == ord("\n")
+    is_letter = ~(is_newline | np.isin(buf, list(b" \t\r")))
+    line_ids = np.cumsum(is_newline)[is_letter]
+    letters_per_line = np.bincount(line_ids)
+    assert np.all(
+        (letters_per_line == 0) | (letters_per_line == 2)
+    ), "Each line must have one choice in each column."
+    columns = buf[is_letter].reshape(-1, 2)
+    a = _letter_codes(alphabets[0])[columns[:, 0]]
+    b = _letter_codes(alphabets[1])[columns[:, 1]]
+    assert np.all(a >= 0) and np.all(b >= 0), "Unknown choice in strategy guide."
+    return a, b
+
+
+def count_line_types(data: bytes | memoryview) -> LineTypeCounts:
+    """Count the occurrences of each of the 9 line types directly from raw bytes.
+
+    Args:
+        data (bytes | memoryview): Raw strategy guide data.
+
+    Returns:
+        LineTypeCounts: 3x3 histogram of the line types.
+    """
+    a, b = encode_strategy(data)
+    return np.bincount(a * 3 + b, minlength=9).reshape(3, 3)
+
+
+def _split_at_line_boundaries(mm: mmap.mmap, n_chunks: int) -> list[tuple[int, int]]:
+    size = len(mm)
+    bounds = [0]
+    for i in range(1, n_chunks):
+        offset = max(size * i // n_chunks, bounds[-1])
+        newline = mm.find(b"\n", offset)
+        if bounds[-1] < (b := newline + 1) < size:
+            bounds.append(b)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _count_line_types_in_range(path: Path, chunk: tuple[int, int]) -> LineTypeCounts:
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm)[chunk[0] : chunk[1]] as view:
+                return count_line_types(view)
+
+
+def count_line_types_in_file(
+    path: Path, workers: int | None = None, chunk_bytes: int = 2**26
+) -> LineTypeCounts:
+    """Count the line types of a memory-mapped file using multiple processes.
+
+    The file is split into byte ranges aligned to line boundaries and each worker
+    counts the line types of its ranges directly from the memory map, so memory
+    use is bounded by the range size no matter how large the file is.
+
+    Args:
+        path (Path): Strategy guide file.
+        workers (int | None, optional): Number of worker processes. Defaults to
+        `None` for the number of CPUs.
+        chunk_bytes (int, optional): Approximate size of each range. Defaults to
+        64 MiB.
+
+    Returns:
+        LineTypeCounts: 3x3 histogram of the line types.
+    """
+    counts = np.zeros((3, 3), dtype=np.int64)
+    if (size := path.stat().st_size) == 0:
+        return counts
+    workers = workers or os.cpu_count() or 1
+    n_chunks = max(workers, -(-size // chunk_bytes))
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            chunks = _split_at_line_boundaries(mm, n_chunks=n_chunks)
+    with ProcessPoolExecutor(workers) as pool:
+        for chunk_counts in pool.map(_count_line_types_in_range, repeat(path), chunks):
+            counts += chunk_counts
+    return counts
+
+
+def score_line_types(counts: LineTypeCounts, table: ScoreTable) -> int:
+    """Total points for a histogram of line types given the points of each type."""
+    return int(np.sum(counts * table))
+
+
+ChoiceMapping = dict[str, str]
+OutcomeMapping = dict[str, RPSResult]
+
+ALL_CHOICE_MAPPINGS: Final[list[ChoiceMapping]] = [
+    dict(zip("XYZ", p)) for p in permutations("ABC")
+]
+ALL_OUTCOME_MAPPINGS: Final[list[OutcomeMapping]] = [
+    dict(zip("XYZ", p)) for p in permutations(RPSResult)
+]
+
+_abc_to_xyz: Final[dict[str, str]] = {
+    v: k for k, v in rps_choice_conversion_table.items()
+}
+
+
+def choice_mapping_score_table(mapping: ChoiceMapping) -> ScoreTable:
+    """Points of each line type when the second column is decoded as my choice."""
+    return make_score_table(lambda a, b: score_round_1(a, _abc_to_xyz[mapping[b]]))
+
+
+def outcome_mapping_score_table(mapping: OutcomeMapping) -> ScoreTable:
+    """Points of each line type when the second column is decoded as the outcome."""
+
+    def _score(a: str, b: str) -> int:
+        choice = get_choice_to_win(a, mapping[b])
+        return game_result_points[mapping[b]] + choice_played_points_abc[choice]
+
+    return make_score_table(_score)
+
+
+def score_strategies(
+    counts: LineTypeCounts, tables: Sequence[ScoreTable] | npt.NDArray[np.int64]
+) -> npt.NDArray[np.int64]:
+    """Total points of a tournament under many interpretations at once.
+
+    Scoring is a single matrix product of the stacked score tables with the
+    line-type histogram so the cost does not depend on the number of rounds.
+
+    Args:
+        counts (LineTypeCounts): Histogram of the line types.
+        tables (Sequence[ScoreTable] | npt.NDArray[np.int64]): Score table for each
+        interpretation of the strategy guide.
+
+    Returns:
+        npt.NDArray[np.int64]: Total points for each interpretation.
+    """
+    stacked = np.asarray(tables, dtype=np.int64).reshape(-1, 9)
+    return stacked @ counts.reshape(9)
+
+
 def main() -> None:
     """Execute puzzles."""
     input_strategy = parse_game_strategy(read_input_to_string(day=DAY))
@@ -170,8 +369,51 @@ def main() -> None:
     res2 = puzzle_2(input_strategy)
     check_result(12014, res2)
 
+    # Histogram engine.
+    ex_counts = count_line_types(example_strategy_guide.encode())
+    check_result(15, score_line_types(ex_counts, PUZZLE_1_SCORES))
+    check_result(12, score_line_types(ex_counts, PUZZLE_2_SCORES))
+    counts = count_line_types(read_input_to_bytes(DAY))
+    check_result(res1, score_line_types(counts, PUZZLE_1_SCORES))
+    check_result(res2, score_line_types(counts, PUZZLE_2_SCORES))
+
+    # Cyclic game engine.
+    a, b = encode_strategy(read_input_to_bytes(DAY))
+    check_result(res1, int(ROCK_PAPER_SCISSORS.score(a, b).sum()))
+    my_choices = ROCK_PAPER_SCISSORS.choice_for_outcome(a, b - 1)
+    check_result(res2, int(ROCK_PAPER_SCISSORS.score(a, my_choices).sum()))
+    a, b = encode_strategy(b"A W\nE Z\nC V\nB Y\n", alphabets=("ABCDE", "VWXYZ"))
+    check_result([8, 8, 7, 4], CyclicGame(n_choices=5).score(a, b).tolist())
+
+    # Batch evaluation of every interpretation of the strategy guide.
+    choice_scores = score_strategies(
+        counts, [choice_mapping_score_table(m) for m in ALL_CHOICE_MAPPINGS]
+    )
+    i = ALL_CHOICE_MAPPINGS.index(rps_choice_conversion_table)
+    check_result(res1, int(choice_scores[i]))
+    outcome_scores = score_strategies(
+        counts, [outcome_mapping_score_table(m) for m in ALL_OUTCOME_MAPPINGS]
+    )
+    i = ALL_OUTCOME_MAPPINGS.index(desired_outcome_table)
+    check_result(res2, int(outcome_scores[i]))
+
     print_results(DAY, TITLE, result1=res1, result2=res2)
 
 
+def check_file_engine() -> None:
+    """Check the multiprocess file engine against the in-memory histogram.
+
+    Kept out of `main()` as starting a process pool costs far more than solving
+    the puzzle input (and `main()` may itself run in a pool worker).
+    """
+    expected = count_line_types(read_input_to_bytes(DAY))
+    # Small ranges to split the input many times.
+    counts = count_line_types_in_file(
+        puzzle_input_file(DAY), workers=2, chunk_bytes=2**10
+    )
+    check_result(expected.tolist(), counts.tolist())
+
+
 if __name__ == "__main__":
     main()
+    check_file_engine()
@@ -1,11 +1,19 @@
 """Advent of Code 2022 – Day 3. Rucksack Reorganization."""
 
+from collections.abc import Callable, Iterable, Iterator
 from string import ascii_lowercase, ascii_uppercase
 from typing import Final
 
+import numpy as np
+import numpy.typing as npt
+
 from advent_of_code.checks import check_result
 from advent_of_code.cli_helpers import print_results
-from advent_of_code.data import read_input_to_string
+from advent_of_code.data import (
+    iter_input_lines,
+    read_input_to_bytes,
+    read_input_to_string,
+)
 
 DAY: Final[int] = 3
 TITLE: Final[str] = "Rucksack Reorganization"
@@ -44,6 +52,31 @@ def convert_input_into_rucksacks(input_data: str) -> list[Rucksack]:
     return rucksacks
 
 
+def make_object_priority_table() -> dict[str, int]:
+    """Create an object:priority table."""
+    return {k: i + 1 for i, k in enumerate(list(ascii_lowercase + ascii_uppercase))}
+
+
+# Each object is a single bit of a 52-bit mask: bit `priority - 1`.
+_object_bits: Final[dict[str, int]] = {
+    k: 1 << (p - 1) for k, p in make_object_priority_table().items()
+}
+
+
+def object_mask(objects: str) -> int:
+    """Encode a collection of objects as a bitmask over their priorities."""
+    mask = 0
+    for c in objects:
+        mask |= _object_bits[c]
+    return mask
+
+
+def mask_priority(mask: int) -> int:
+    """Priority of the only object in a mask."""
+    assert mask != 0 and mask & (mask - 1) == 0, "Mask must have exactly 1 object."
+    return mask.bit_length()
+
+
 def find_object_in_both_compartments(rucksack: Rucksack) -> str:
     """Find the object in both compartments of a rucksack."""
     in_both = set(rucksack.compartments[0]).intersection(rucksack.compartments[1])
@@ -51,11 +84,6 @@ def find_object_in_both_compartments(rucksack: Rucksack) -> str:
     return list(in_both)[0]
 
 
-def make_object_priority_table() -> dict[str, int]:
-    """Create an object:priority table."""
-    return {k: i + 1 for i, k in enumerate(list(ascii_lowercase + ascii_uppercase))}
-
-
 def puzzle_1(rucksacks: list[Rucksack]) -> int:
     """Puzzle 1."""
     total = 0
@@ -87,6 +115,205 @@ def puzzle_2(rucksacks: list[Rucksack]) -> int:
     return total
 
 
+# Object bit for each byte value (0 if not an object).
+_byte_bits: Final[list[int]] = [_object_bits.get(chr(b), 0) for b in range(256)]
+
+
+class RucksackView:
+    """Rucksack as a zero-copy view of a line in a shared input buffer."""
+
+    __slots__ = ("_buffer", "_start", "_stop")
+
+    def __init__(self, buffer: memoryview, start: int, stop: int) -> None:
+        self._buffer = buffer
+        self._start = start
+        self._stop = stop
+
+    @property
+    def objects(self) -> memoryview:
+        """All objects in the rucksack."""
+        return self._buffer[self._start : self._stop]
+
+    @property
+    def compartments(self) -> tuple[memoryview, memoryview]:
+        """Objects in each compartment."""
+        split = self._start + (self._stop - self._start) // 2
+        return self._buffer[self._start : split], self._buffer[split : self._stop]
+
+    def __str__(self) -> str:
+        return " ".join(bytes(c).decode() for c in self.compartments)
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+def iter_rucksack_views(data: bytes) -> Iterator[RucksackView]:
+    """Split raw input into rucksack views without copying any objects."""
+    buffer = memoryview(data)
+    start = 0
+    while start < len(data):
+        if (end := data.find(b"\n", start)) == -1:
+            end = len(data)
+        # Trim surrounding whitespace as `Rucksack` does.
+        stop = end
+        while stop > start and data[stop - 1] in b" \t\r":
+            stop -= 1
+        while start < stop and data[start] in b" \t\r":
+            start += 1
+        if stop > start:
+            yield RucksackView(buffer, start, stop)
+        start = end + 1
+
+
+def view_mask(objects: memoryview) -> int:
+    """Encode the objects of a view as a bitmask over their priorities."""
+    mask = 0
+    for b in objects:
+        mask |= _byte_bits[b]
+    return mask
+
+
+def views_puzzle_1(views: Iterable[RucksackView]) -> int:
+    """Puzzle 1 over rucksack views."""
+    total = 0
+    for view in views:
+        a, b = view.compartments
+        total += mask_priority(view_mask(a) & view_mask(b))
+    return total
+
+
+def views_puzzle_2(views: Iterable[RucksackView]) -> int:
+    """Puzzle 2 over rucksack views."""
+    total = 0
+    for group in zip(*[iter(views)] * 3, strict=True):
+        a, b, c = (view_mask(v.objects) for v in group)
+        total += mask_priority(a & b & c)
+    return total
+
+
+# Rule deciding if a rucksack starts a new group from its index and objects.
+GroupingRule = Callable[[int, str], bool]
+
+
+def fixed_size_groups(group_size: int) -> GroupingRule:
+    """Grouping rule for consecutive groups of `group_size` rucksacks."""
+    assert group_size > 0, "Group size must be positive."
+    return lambda i, _: i % group_size == 0
+
+
+def iter_group_badges(
+    lines: Iterable[str], group_size: int = 3, rule: GroupingRule | None = None
+) -> Iterator[int]:
+    """Stream the badge priority of each group of rucksacks.
+
+    Only the running mask of the current group is kept so the lines can be
+    consumed lazily (e.g. from `iter_input_lines`) in constant memory.
+
+    Args:
+        lines (Iterable[str]): One rucksack per line (blank lines are skipped).
+        group_size (int, optional): Number of rucksacks per group. Defaults to 3.
+        rule (GroupingRule | None, optional): Custom rule to use instead of fixed
+        size groups. Defaults to `None`.
+
+    Yields:
+        Iterator[int]: Priority of the badge of each group.
+    """
+    starts_group = rule or fixed_size_groups(group_size)
+    badge: int | None = None
+    i = 0
+    for line in lines:
+        if len(objects := line.strip()) == 0:
+            continue
+        mask = object_mask(objects)
+        if starts_group(i, objects):
+            if badge is not None:
+                yield mask_priority(badge)
+            badge = mask
+        else:
+            assert badge is not None, "First rucksack must start a group."
+            badge &= mask
+        i += 1
+    if rule is None:
+        assert (
+            i % group_size == 0
+        ), f"Rucksacks must divide into groups of {group_size}."
+    if badge is not None:
+        yield mask_priority(badge)
+
+
+PresenceMatrix = npt.NDArray[np.bool_]
+
+
+def _make_byte_object_index() -> npt.NDArray[np.int64]:
+    # Object index (`priority - 1`) of each byte value (-1 if not an object).
+    priorities = make_object_priority_table()
+    indices = [priorities.get(chr(b), 0) - 1 for b in range(256)]
+    return np.array(indices, dtype=np.int64)
+
+
+_byte_object_index: Final[npt.NDArray[np.int64]] = _make_byte_object_index()
+
+
+def compartment_presence_matrices(
+    data: bytes,
+) -> tuple[PresenceMatrix, PresenceMatrix]:
+    """Vectorized parsing of raw input into object presence matrices.
+
+    Args:
+        data (bytes): Raw input data with one rucksack per line.
+
+    Returns:
+        tuple[PresenceMatrix, PresenceMatrix]: (N, 52) boolean matrices of which
+        objects are in the first and second compartment of each rucksack.
+    """
+    buf = np.frombuffer(data + b"\n", dtype=np.uint8)
+    is_newline = buf == ord("\n")
+    line_starts = np.concatenate([[0], np.flatnonzero(is_newline)[:-1] + 1])
+    line_ids = np.cumsum(is_newline) - is_newline
+
+    # Span of the objects in each line (surrounding whitespace is ignored).
+    objects = _byte_object_index[buf]
+    is_object = objects >= 0
+    pos = np.arange(len(buf))
+    first_object = np.minimum.reduceat(np.where(is_object, pos, len(buf)), line_starts)
+    last_object = np.maximum.reduceat(np.where(is_object, pos, -1), line_starts)
+    n_objects = np.add.reduceat(is_object.astype(np.int64), line_starts)
+    has_objects = n_objects > 0
+    assert np.all(
+        ~has_objects | (last_object - first_object + 1 == n_objects)
+    ), "Expected the objects of each rucksack to be contiguous."
+
+    # Rows of the rucksacks (lines without objects are skipped).
+    rows = np.cumsum(has_objects) - 1
+    split = (first_object + n_objects // 2)[line_ids]
+    in_first = is_object & (pos < split)
+    in_second = is_object & (pos >= split)
+
+    first = np.zeros((int(has_objects.sum()), 52), dtype=bool)
+    second = np.zeros_like(first)
+    first[rows[line_ids[in_first]], objects[in_first]] = True
+    second[rows[line_ids[in_second]], objects[in_second]] = True
+    return first, second
+
+
+def _sum_single_object_priorities(presence: PresenceMatrix) -> int:
+    assert np.all(presence.sum(axis=1) == 1), "Expected exactly 1 object per row."
+    return int(np.sum(presence.argmax(axis=1) + 1))
+
+
+def batch_puzzle_1(first: PresenceMatrix, second: PresenceMatrix) -> int:
+    """Puzzle 1 over presence matrices."""
+    return _sum_single_object_priorities(first & second)
+
+
+def batch_puzzle_2(first: PresenceMatrix, second: PresenceMatrix) -> int:
+    """Puzzle 2 over presence matrices."""
+    rucksacks = first | second
+    assert len(rucksacks) % 3 == 0, "Rucksacks must divide into groups of 3."
+    badges = np.all(rucksacks.reshape(-1, 3, 52), axis=1)
+    return _sum_single_object_priorities(badges)
+
+
 def main() -> None:
     """Execute puzzles."""
     ex_rucksacks = convert_input_into_rucksacks(example_input)
@@ -104,6 +331,26 @@ def main() -> None:
     res2 = puzzle_2(rucksacks)
     check_result(2646, res2)
 
+    # Vectorized engine.
+    ex_presence = compartment_presence_matrices(example_input.encode())
+    check_result(157, batch_puzzle_1(*ex_presence))
+    check_result(70, batch_puzzle_2(*ex_presence))
+    presence = compartment_presence_matrices(read_input_to_bytes(DAY))
+    check_result(res1, batch_puzzle_1(*presence))
+    check_result(res2, batch_puzzle_2(*presence))
+
+    # Zero-copy rucksack views.
+    ex_views = list(iter_rucksack_views(example_input.encode()))
+    check_result(157, views_puzzle_1(ex_views))
+    check_result(70, views_puzzle_2(ex_views))
+    views = list(iter_rucksack_views(read_input_to_bytes(DAY)))
+    check_result(res1, views_puzzle_1(views))
+    check_result(res2, views_puzzle_2(views))
+
+    # Streaming badge search.
+    check_result(70, sum(iter_group_badges(example_input.splitlines())))
+    check_result(res2, sum(iter_group_badges(iter_input_lines(DAY))))
+
     print_results(DAY, TITLE, result1=res1, result2=res2)
 
 
@@ -1,10 +1,17 @@
 """Advent of Code 2022 – Day 4. Camp Cleanup."""
 
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
 from typing import Final
 
+import numpy as np
+import numpy.typing as npt
+
 from advent_of_code.checks import check_result
 from advent_of_code.cli_helpers import print_results
-from advent_of_code.data import read_input_to_string
+from advent_of_code.data import read_input_to_bytes, read_input_to_string
 
 DAY: Final[int] = 4
 TITLE: Final[str] = "Camp Cleanup"
@@ -83,6 +90,305 @@ def puzzle_2(range_pairs: CleaningRangePairs) -> int:
     return total
 
 
+# (N, 4) array of `a.start, a.end, b.start, b.end` for each pair.
+RangePairArray = npt.NDArray[np.int32]
+
+
+def parse_range_pair_array(data: bytes) -> RangePairArray:
+    """Vectorized parsing of raw input into an array of range pairs.
+
+    Each run of digits is a number: its digits are weighted by their place value
+    and summed per run with `np.add.reduceat`.
+
+    Args:
+        data (bytes): Raw input data with one `a-b,c-d` pair per line.
+
+    Returns:
+        RangePairArray: (N, 4) array of range bounds.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    is_digit = (buf >= ord("0")) & (buf <= ord("9"))
+    edges = np.diff(is_digit.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    assert len(starts) % 4 == 0, "Expected 4 numbers per line."
+    lengths = ends - starts
+    digit_idx = np.flatnonzero(is_digit)
+    place = np.repeat(ends, lengths) - 1 - digit_idx
+    weighted = (buf[digit_idx] - ord("0")).astype(np.int64) * 10**place
+    run_offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    values = np.add.reduceat(weighted, run_offsets) if len(starts) else weighted
+    return values.astype(np.int32).reshape(-1, 4)
+
+
+def count_contained_pairs(pairs: RangePairArray) -> int:
+    """Count the pairs where one range is within the other."""
+    a0, a1, b0, b1 = pairs.T
+    return int(np.sum(((b0 <= a0) & (a1 <= b1)) | ((a0 <= b0) & (b1 <= a1))))
+
+
+def count_overlapping_pairs(pairs: RangePairArray) -> int:
+    """Count the pairs where the ranges overlap."""
+    a0, a1, b0, b1 = pairs.T
+    return int(np.sum((a0 <= b1) & (b0 <= a1)))
+
+
+IntArray = npt.NDArray[np.int64]
+
+
+@dataclass
+class _IntervalNode:
+    """Node of a centered interval tree."""
+
+    center: int
+    starts: IntArray  # Sorted starts of the intervals containing `center`.
+    by_start: IntArray  # Interval ids in the order of `starts`.
+    ends: IntArray  # Sorted ends of the intervals containing `center`.
+    by_end: IntArray  # Interval ids in the order of `ends`.
+    left: _IntervalNode | None
+    right: _IntervalNode | None
+
+
+def _build_interval_tree(
+    lo: IntArray, hi: IntArray, ids: IntArray
+) -> _IntervalNode | None:
+    if len(ids) == 0:
+        return None
+    center = int(np.median(np.concatenate([lo[ids], hi[ids]])))
+    on_left = hi[ids] < center
+    on_right = lo[ids] > center
+    here = ids[~on_left & ~on_right]
+    start_order = np.argsort(lo[here], kind="stable")
+    end_order = np.argsort(hi[here], kind="stable")
+    return _IntervalNode(
+        center=center,
+        starts=lo[here][start_order],
+        by_start=here[start_order],
+        ends=hi[here][end_order],
+        by_end=here[end_order],
+        left=_build_interval_tree(lo, hi, ids[on_left]),
+        right=_build_interval_tree(lo, hi, ids[on_right]),
+    )
+
+
+class SectionIndex:
+    """Index of cleaning assignments for section-coverage queries.
+
+    Counts are answered from sorted endpoint arrays with binary searches and the
+    assignments themselves are listed from a centered interval tree, so queries
+    take logarithmic time plus the number of assignments reported.
+    """
+
+    def __init__(self, intervals: npt.ArrayLike) -> None:
+        """Build the index.
+
+        Args:
+            intervals (npt.ArrayLike): (M, 2) array of inclusive section ranges.
+            Each assignment is identified by its row in this array.
+        """
+        bounds = np.asarray(intervals, dtype=np.int64).reshape(-1, 2)
+        self.lo: IntArray = bounds[:, 0]
+        self.hi: IntArray = bounds[:, 1]
+        self._sorted_lo = np.sort(self.lo)
+        self._sorted_hi = np.sort(self.hi)
+        self._lo_order = np.argsort(self.lo, kind="stable")
+        self._root = _build_interval_tree(
+            self.lo, self.hi, np.arange(len(bounds), dtype=np.int64)
+        )
+
+    @classmethod
+    def from_pairs(cls, pairs: RangePairArray) -> SectionIndex:
+        """Index both elves of each pair (elf `j` of pair `i` has id `2i + j`)."""
+        return cls(pairs.reshape(-1, 2))
+
+    def __len__(self) -> int:
+        return len(self.lo)
+
+    def count_covering(self, sections: npt.ArrayLike) -> IntArray:
+        """Number of assignments covering each section."""
+        s = np.asarray(sections, dtype=np.int64)
+        started = np.searchsorted(self._sorted_lo, s, side="right")
+        finished = np.searchsorted(self._sorted_hi, s, side="left")
+        return started - finished
+
+    def count_intersecting(self, lo: npt.ArrayLike, hi: npt.ArrayLike) -> IntArray:
+        """Number of assignments intersecting each range `[lo, hi]`."""
+        ends_before = np.searchsorted(self._sorted_hi, lo, side="left")
+        starts_after = len(self) - np.searchsorted(self._sorted_lo, hi, side="right")
+        return len(self) - ends_before - starts_after
+
+    def covering(self, section: int) -> IntArray:
+        """Sorted ids of the assignments covering a section."""
+        found: list[IntArray] = []
+        node = self._root
+        while node is not None:
+            if section < node.center:
+                found.append(
+                    node.by_start[: np.searchsorted(node.starts, section, "right")]
+                )
+                node = node.left
+            elif section > node.center:
+                found.append(node.by_end[np.searchsorted(node.ends, section, "left") :])
+                node = node.right
+            else:
+                found.append(node.by_start)
+                break
+        return np.sort(np.concatenate(found)) if found else np.empty(0, np.int64)
+
+    def intersecting(self, lo: int, hi: int) -> IntArray:
+        """Sorted ids of the assignments intersecting the range `[lo, hi]`."""
+        # Either the assignment covers `lo` or it starts within `(lo, hi]`.
+        first = np.searchsorted(self._sorted_lo, lo, side="right")
+        last = np.searchsorted(self._sorted_lo, hi, side="right")
+        starting = self._lo_order[first:last]
+        return np.sort(np.concatenate([self.covering(lo), starting]))
+
+    def batch_covering(self, sections: Iterable[int]) -> list[IntArray]:
+        """Assignments covering each of many sections."""
+        return [self.covering(s) for s in sections]
+
+    def batch_intersecting(self, ranges: Iterable[tuple[int, int]]) -> list[IntArray]:
+        """Assignments intersecting each of many ranges."""
+        return [self.intersecting(lo, hi) for lo, hi in ranges]
+
+
+def count_overlapping_assignments(intervals: npt.ArrayLike) -> int:
+    """Count every pair of assignments that overlap across the whole input.
+
+    Sweeping the starts in order, each assignment overlaps all assignments that
+    started no later and have not ended before it starts. The number still
+    active is found with a binary search of the sorted ends.
+
+    Args:
+        intervals (npt.ArrayLike): (M, 2) array of inclusive section ranges.
+
+    Returns:
+        int: Number of unordered pairs of overlapping assignments.
+    """
+    bounds = np.asarray(intervals, dtype=np.int64).reshape(-1, 2)
+    lo = np.sort(bounds[:, 0])
+    ended = np.searchsorted(np.sort(bounds[:, 1]), lo, side="left")
+    started_before = np.arange(len(lo))
+    return int(np.sum(started_before - ended))
+
+
+def count_nested_assignments(intervals: npt.ArrayLike) -> int:
+    """Count every pair of assignments where one is within the other.
+
+    Sweeping the assignments by start (widest first for equal starts), each is
+    within every earlier assignment that ends no earlier than it does. Earlier
+    ends are tallied in a Fenwick tree over the ranks of the ends.
+
+    Args:
+        intervals (npt.ArrayLike): (M, 2) array of inclusive section ranges.
+
+    Returns:
+        int: Number of unordered pairs of nested assignments (identical
+        assignments count as one pair).
+    """
+    bounds = np.asarray(intervals, dtype=np.int64).reshape(-1, 2)
+    order = np.lexsort((-bounds[:, 1], bounds[:, 0]))
+    ends = bounds[order, 1]
+    ranks = np.searchsorted(np.unique(ends), ends) + 1
+    tree = [0] * (int(ranks.max(initial=0)) + 1)
+    total = 0
+    for n_seen, rank in enumerate(ranks.tolist()):
+        # Number of earlier assignments ending before this one.
+        i, ending_before = rank - 1, 0
+        while i > 0:
+            ending_before += tree[i]
+            i -= i & -i
+        total += n_seen - ending_before
+        i = rank
+        while i < len(tree):
+            tree[i] += 1
+            i += i & -i
+    return total
+
+
+@dataclass
+class CoverageProfile:
+    """Number of assignments covering each section.
+
+    Coverage is stored as runs: `counts[i]` assignments cover each section from
+    `breaks[i]` up to (but excluding) `breaks[i + 1]`. The last count is always 0.
+    """
+
+    breaks: IntArray
+    counts: IntArray
+
+    def coverage(self, sections: npt.ArrayLike) -> IntArray:
+        """Number of assignments covering each section."""
+        run = np.searchsorted(self.breaks, sections, side="right") - 1
+        counts = np.append(self.counts, 0)  # Index -1 is before the first run.
+        return counts[run]
+
+    @property
+    def peak(self) -> int:
+        """Maximum number of assignments covering a single section."""
+        return int(self.counts.max(initial=0))
+
+    def _runs_with_count(self, count: int) -> IntArray:
+        # Merge consecutive runs with the count (every section is a run if dense).
+        edges = np.diff(
+            (self.counts[:-1] == count).astype(np.int8), prepend=0, append=0
+        )
+        starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        return np.stack([self.breaks[starts], self.breaks[stops]], axis=1)
+
+    def peak_sections(self) -> IntArray:
+        """Runs of sections covered by the most assignments.
+
+        Returns:
+            IntArray: (K, 2) array of the start (inclusive) and stop (exclusive)
+            section of each run.
+        """
+        return self._runs_with_count(self.peak)
+
+    def uncovered_sections(self) -> IntArray:
+        """Runs of sections between the first and last assigned with no cover.
+
+        Returns:
+            IntArray: (K, 2) array of the start (inclusive) and stop (exclusive)
+            section of each run.
+        """
+        return self._runs_with_count(0)
+
+
+def coverage_profile(
+    intervals: npt.ArrayLike, max_dense_span: int = 1 << 24
+) -> CoverageProfile:
+    """Coverage profile of assignments from a difference array.
+
+    Each assignment adds 1 at its start and subtracts 1 after its end, and the
+    cumulative sum gives the coverage. If the sections span more than
+    `max_dense_span` IDs, the difference array is built over only the distinct
+    endpoints instead of every section.
+
+    Args:
+        intervals (npt.ArrayLike): (M, 2) array of inclusive section ranges.
+        max_dense_span (int, optional): Largest section span to use a dense
+        difference array for. Defaults to 2**24.
+
+    Returns:
+        CoverageProfile: Coverage of every section.
+    """
+    bounds = np.asarray(intervals, dtype=np.int64).reshape(-1, 2)
+    lo, hi = bounds[:, 0], bounds[:, 1] + 1
+    if len(bounds) == 0:
+        return CoverageProfile(np.empty(0, np.int64), np.empty(0, np.int64))
+    first, span = int(lo.min()), int(hi.max() - lo.min())
+    if span <= max_dense_span:
+        diff = np.bincount(lo - first, minlength=span + 1)
+        diff -= np.bincount(hi - first, minlength=span + 1)
+        breaks = np.arange(first, first + span + 1)
+    else:
+        breaks, idx = np.unique(np.concatenate([lo, hi]), return_inverse=True)
+        diff = np.bincount(idx[: len(lo)], minlength=len(breaks))
+        diff -= np.bincount(idx[len(lo) :], minlength=len(breaks))
+    return CoverageProfile(breaks=breaks, counts=np.cumsum(diff))
+
+
 def main() -> None:
     """Execute puzzles."""
     example_ranges = _convert_input_to_cleaning_range_pairs(example_input)
@@ -100,6 +406,46 @@ def main() -> None:
     res2 = puzzle_2(cleaning_ranges)
     check_result(897, res2)
 
+    # Vectorized engine.
+    ex_pairs = parse_range_pair_array(example_input.encode())
+    check_result(2, count_contained_pairs(ex_pairs))
+    check_result(4, count_overlapping_pairs(ex_pairs))
+    pairs = parse_range_pair_array(read_input_to_bytes(DAY))
+    check_result(res1, count_contained_pairs(pairs))
+    check_result(res2, count_overlapping_pairs(pairs))
+
+    # Section-coverage index.
+    ex_index = SectionIndex.from_pairs(ex_pairs)
+    check_result([1, 4, 6, 7, 8, 9, 10, 11], ex_index.covering(6).tolist())
+    check_result(8, int(ex_index.count_covering([6])[0]))
+    check_result([0, 3, 6, 7, 9, 10, 11], ex_index.intersecting(4, 4).tolist())
+    index = SectionIndex.from_pairs(pairs)
+    sections = np.arange(pairs.min(), pairs.max() + 1)
+    check_result(
+        [len(ids) for ids in index.batch_covering(sections)],
+        index.count_covering(sections).tolist(),
+    )
+
+    # Global sweep over all assignments.
+    check_result(49, count_overlapping_assignments(ex_pairs.reshape(-1, 2)))
+    check_result(29, count_nested_assignments(ex_pairs.reshape(-1, 2)))
+    check_result(1288798, count_overlapping_assignments(pairs.reshape(-1, 2)))
+    check_result(833562, count_nested_assignments(pairs.reshape(-1, 2)))
+
+    # Section coverage profile.
+    ex_profile = coverage_profile(ex_pairs.reshape(-1, 2))
+    check_result(8, ex_profile.peak)
+    check_result([[6, 7]], ex_profile.peak_sections().tolist())
+    check_result([], ex_profile.uncovered_sections().tolist())
+    profile = coverage_profile(pairs.reshape(-1, 2))
+    sparse_profile = coverage_profile(pairs.reshape(-1, 2), max_dense_span=0)
+    check_result(
+        index.count_covering(sections).tolist(), profile.coverage(sections).tolist()
+    )
+    check_result(
+        profile.coverage(sections).tolist(), sparse_profile.coverage(sections).tolist()
+    )
+
     print_results(DAY, TITLE, result1=res1, result2=res2)
 
 
@@ -94,6 +94,24 @@ class CrateConfiguration:
                     columns[c].append(x)
         self.columns = columns
 
+    def move_crates(self, n: int, from_col: int, to_col: int, keep_order: bool) -> None:
+        """Move the top crates of one column onto another in bulk.
+
+        Args:
+            n (int): Number of crates to move.
+            from_col (int): Index of the column to move the crates from.
+            to_col (int): Index of the column to move the crates to.
+            keep_order (bool): Keep the order of the moved crates (as if moved all
+            at once) instead of reversing it (as if moved one at a time).
+        """
+        src = self.columns[from_col]
+        assert 0 <= n <= len(src), f"Cannot move {n} crates from column {from_col}."
+        if n == 0 or from_col == to_col:
+            return
+        moved = src[-n:] if keep_order else src[: -n - 1 : -1]
+        del src[-n:]
+        self.columns[to_col].extend(moved)
+
     def __str__(self) -> str:
         msg = "Crate Configuration\n" + ("-" * 25) + "\n"
         for i, col in enumerate(self.columns):
@@ -133,8 +151,7 @@ def parse_input_to_crates(
 def crane_9000_move(config: CrateConfiguration, instruction: MoveInstruction) -> None:
     """Move the crates given a single instruction for crane 9000."""
     n, f, t = instruction.move, instruction.from_col - 1, instruction.to_col - 1
-    for _ in range(n):
-        config.columns[t].append(config.columns[f].pop())
+    config.move_crates(n, f, t, keep_order=False)
 
 
 def puzzle_1(configuration: CrateConfiguration, instructions: MoveInstructions) -> str:
@@ -148,13 +165,7 @@ def puzzle_1(configuration: CrateConfiguration, instructions: MoveInstructions)
 def crane_9001_move(config: CrateConfiguration, instruction: MoveInstruction) -> None:
     """Move the crates given a single instruction for crane 9001."""
     n, f, t = instruction.move, instruction.from_col - 1, instruction.to_col - 1
-    if n == 1:
-        crane_9000_move(config, instruction)
-    else:
-        col = config.columns[f]
-        new_col = col[:-n]
-        config.columns[t] += col[-n:]
-        config.columns[f] = new_col
+    config.move_crates(n, f, t, keep_order=True)
 
 
 def puzzle_2(configuration: CrateConfiguration, instructions: MoveInstructions) -> str:
@@ -166,6 +177,50 @@ def puzzle_2(configuration: CrateConfiguration, instructions: MoveInstructions)
     return msg
 
 
+def trace_top_crates(
+    configuration: CrateConfiguration, instructions: MoveInstructions, keep_order: bool
+) -> str:
+    """Find the final top crate of each column without moving any crates.
+
+    The final position of each top crate is traced backwards through the
+    instructions to its original position, tracking only its column and depth
+    below the top of the column. The cost is independent of the number of crates
+    moved by each instruction.
+
+    Args:
+        configuration (CrateConfiguration): Initial crate configuration (not
+        modified).
+        instructions (MoveInstructions): Move instructions.
+        keep_order (bool): Crane 9001 semantics (keep the order of moved crates)
+        instead of crane 9000 (reverse the order).
+
+    Returns:
+        str: Top crate of each non-empty column after all instructions.
+    """
+    moves = [(i.move, i.from_col - 1, i.to_col - 1) for i in instructions.instructions]
+    heights = [len(col) for col in configuration.columns]
+    for n, f, t in moves:
+        heights[f] -= n
+        heights[t] += n
+
+    tops: list[str] = []
+    for col, height in enumerate(heights):
+        if height == 0:
+            continue
+        c, depth = col, 0
+        for n, f, t in reversed(moves):
+            if f == t:
+                continue
+            if c == t and depth < n:
+                c, depth = f, depth if keep_order else n - 1 - depth
+            elif c == t:
+                depth -= n
+            elif c == f:
+                depth += n
+        tops.append(configuration.columns[c][-1 - depth])
+    return "".join(tops)
+
+
 def main() -> None:
     """Execute puzzles."""
     # Puzzle 1.
@@ -184,6 +239,14 @@ def main() -> None:
     res2 = puzzle_2(config, instructions)
     check_result("CQQBBJFCS", res2)
 
+    # Top crates only.
+    example_config, example_instruct = parse_input_to_crates(example_input)
+    config, instructions = parse_input_to_crates(read_input_to_string(DAY))
+    check_result("CMZ", trace_top_crates(example_config, example_instruct, False))
+    check_result("MCD", trace_top_crates(example_config, example_instruct, True))
+    check_result(res1, trace_top_crates(config, instructions, keep_order=False))
+    check_result(res2, trace_top_crates(config, instructions, keep_order=True))
+
     print_results(DAY, TITLE, result1=res1, result2=res2)
 
 
@@ -1,7 +1,9 @@
 """Advent of Code 2022 – Day 6. Tuning Trouble."""
 
+from string import ascii_lowercase
 from typing import Final
 
+from advent_of_code.benchmarks import microbenchmark
 from advent_of_code.checks import check_result
 from advent_of_code.cli_helpers import print_results
 from advent_of_code.data import read_input_to_string
@@ -27,6 +29,7 @@ example_inputs_2 = {
 }
 
 
+@microbenchmark(lambda: (("ab" * 2_000 + ascii_lowercase, 14), {}))
 def find_position_of_marker(data: str, n_chars: int) -> int | None:
     """Finf the position of a marker.
 
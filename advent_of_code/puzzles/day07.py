@@ -4,10 +4,10 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from dataclasses import dataclass
-from functools import lru_cache
 from textwrap import indent
 from typing import Final
 
+from advent_of_code.caching import memoize
 from advent_of_code.checks import check_result
 from advent_of_code.cli_helpers import print_results
 from advent_of_code.data import read_input_to_string
@@ -178,7 +178,7 @@ def parse_terminal_command_data(cmd_data: str) -> tuple[Directory, list[Director
     return root_dir, directories
 
 
-@lru_cache
+@memoize(scope="run", maxsize=4096)
 def get_directory_size(d: Directory) -> int:
     """Get the size of a directory."""
     total_size = 0
@@ -4,6 +4,7 @@ from itertools import product
 from math import sqrt
 from typing import Final
 
+from advent_of_code.benchmarks import microbenchmark
 from advent_of_code.checks import check_result
 from advent_of_code.cli_helpers import print_results
 from advent_of_code.data import read_input_to_string
@@ -99,6 +100,7 @@ def distance(a: Position, b: Position) -> float:
     return sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
 
 
+@microbenchmark(lambda: (((3, 5), (1, 4)), {}))
 def find_closest_position_for_b(target: Position, b: Position) -> Position:
     """Find the closest position for point `b` to `target`."""
     new_pos: Position = b
@@ -5,9 +5,11 @@
 from collections.abc import Sequence
 from typing import Final, TypeAlias
 
+from advent_of_code.benchmarks import microbenchmark
 from advent_of_code.checks import check_result
 from advent_of_code.cli_helpers import print_results
 from advent_of_code.data import read_input_to_string
+from advent_of_code.metrics import counter
 
 DAY: Final[int] = 13
 TITLE: Final[str] = "Distress Signal"
@@ -38,6 +40,8 @@ example_input = """
 [1,[2,[3,[4,[5,6,0]]]],8,9]
 """
 
+_comparisons = counter("aoc_day13_comparisons_total", "Packet comparisons in sorting.")
+
 Packet: TypeAlias = list[int] | Sequence["Packet"] | list[int | Sequence["Packet"]]
 PacketPair: TypeAlias = tuple[Packet, Packet]
 
@@ -60,6 +64,12 @@ def parse_distress_signal_code(input_str: str) -> list[PacketPair]:
     return distress_code
 
 
+@microbenchmark(
+    lambda: (
+        ([1, [2, [3, [4, [5, 6, 7]]]], 8, 9], [1, [2, [3, [4, [5, 6, 0]]]], 8, 9]),
+        {},
+    )
+)
 def packet_pair_in_correct_order(
     left: int | Packet, right: int | Packet
 ) -> bool | None:
@@ -103,9 +113,11 @@ def _merge_all_code_packets(packet_pairs: list[PacketPair]) -> list[Packet]:
 
 
 def _all_packets_in_order(packets: list[Packet]) -> bool:
-    for a, b in zip(packets[:-1], packets[1:]):
+    for i, (a, b) in enumerate(zip(packets[:-1], packets[1:])):
         if not packet_pair_in_correct_order(a, b):
+            _comparisons.inc(i + 1)
             return False
+    _comparisons.inc(len(packets) - 1)
     return True
 
 
@@ -119,6 +131,7 @@ def sort_packets(packets: list[Packet]) -> None:
             else:
                 packets[i], packets[i + 1] = packets[i + 1], packets[i]
                 break
+        _comparisons.inc(i + 1)
         if _all_packets_in_order(packets):
             return
 
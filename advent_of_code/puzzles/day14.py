@@ -5,9 +5,11 @@ from typing import Final, TypeAlias
 import numpy as np
 import numpy.typing as npt
 
+from advent_of_code.benchmarks import microbenchmark
 from advent_of_code.checks import check_result
 from advent_of_code.cli_helpers import print_results
 from advent_of_code.data import read_input_to_string
+from advent_of_code.metrics import counter
 
 DAY: Final[int] = 14
 TITLE: Final[str] = "Regolith Reservoir"
@@ -26,6 +28,9 @@ Cave: TypeAlias = npt.NDArray[np.int_]
 #  -1: sand
 #   1: rock
 
+_sand_grains = counter("aoc_day14_sand_grains_total", "Grains of sand dropped.")
+_cells_visited = counter("aoc_day14_cells_visited_total", "Cells visited by sand.")
+
 
 def parse_input_into_paths(input_str: str) -> list[CavePath]:
     """Parse input string into paths.
@@ -95,6 +100,9 @@ def parse_input_to_cave(input_str: str) -> Cave:
     return parse_cave_paths_to_array(parse_input_into_paths(input_str))
 
 
+@microbenchmark(
+    lambda: ((parse_input_to_cave(example_input), (0, 500)), {}), fresh_args=True
+)
 def add_sand_particle(cave: Cave, start: Coord = (0, 500)) -> None:
     """Add a particle of sand to the cave.
 
@@ -103,30 +111,38 @@ def add_sand_particle(cave: Cave, start: Coord = (0, 500)) -> None:
         start (tuple, optional): Where to begin adding sand. Defaults to (0, 500).
     """
     sand: Coord = start
+    n_steps = 0
     while True:
+        n_steps += 1
         if sand[0] + 1 >= cave.shape[0]:
+            _cells_visited.inc(n_steps)
             return
         elif cave[sand[0] + 1, sand[1]] == 0:
             sand = sand[0] + 1, sand[1]
         elif sand[1] - 1 < 0:
+            _cells_visited.inc(n_steps)
             return
         elif cave[sand[0] + 1, sand[1] - 1] == 0:
             sand = sand[0] + 1, sand[1] - 1
         elif sand[1] + 1 >= cave.shape[1]:
+            _cells_visited.inc(n_steps)
             return
         elif cave[sand[0] + 1, sand[1] + 1] == 0:
             sand = sand[0] + 1, sand[1] + 1
         else:
             break
+    _cells_visited.inc(n_steps)
     cave[sand[0], sand[1]] = -1
 
 
 def fill_cave_with_sand(cave: Cave, start: Coord) -> Cave:
     """Fill a cave with sand."""
+    n_start = np.sum(cave == -1)
     n_sand = -1
     while n_sand != np.sum(cave == -1):
         n_sand = np.sum(cave == -1)
         add_sand_particle(cave, start=start)
+    _sand_grains.inc(int(n_sand - n_start))
     return cave
 
 
@@ -7,6 +7,7 @@ from typing import Final, TypeAlias
 from advent_of_code.checks import check_result
 from advent_of_code.cli_helpers import print_results
 from advent_of_code.data import read_input_to_string
+from advent_of_code.metrics import counter
 
 DAY: Final[int] = 15
 TITLE: Final[str] = "Beacon Exclusion Zone"
@@ -40,6 +41,9 @@ class Thing(str, Enum):
     EMPTY = "."
 
 
+_rows_scanned = counter("aoc_day15_rows_scanned_total", "Rows scanned for the beacon.")
+
+
 def manhattan_distance(c1: Coord, c2: Coord) -> int:
     """Calculate the Manhattan distance between two points."""
     return abs(c1[0] - c2[0]) + abs(c1[1] - c2[1])
@@ -132,7 +136,9 @@ def puzzle_2(measurements: list[Measurement], search_range: tuple[int, int]) ->
                 assert gap == 2, "Gap not of length 2."
                 coord = (previous_x + 1, y)
                 print(f"coordinate: {coord}")
+                _rows_scanned.inc(y - search_range[0] + 1)
                 return tuning_frequency(coord)
+    _rows_scanned.inc(search_range[1] - search_range[0])
     raise BaseException("No result found :(")
 
 
@@ -10,10 +10,15 @@ from itertools import product
 from typing import Final
 
 import networkx as nx
+import numpy as np
 
+from advent_of_code import graphs
+from advent_of_code.benchmarks import microbenchmark
+from advent_of_code.caching import memoize, registry
 from advent_of_code.checks import check_result
 from advent_of_code.cli_helpers import print_results
 from advent_of_code.data import read_input_to_string
+from advent_of_code.metrics import counter
 from advent_of_code.utilities import timer
 
 DAY: Final[int] = 16
@@ -187,28 +192,38 @@ class PathTracker:
         self.n_paths += 1
 
 
-_shortest_path_lengths: dict[tuple[str, str], int] = {}
+_states_explored = counter("aoc_day16_states_explored_total", "Path states explored.")
+_states_pruned = counter("aoc_day16_states_pruned_total", "Path states pruned.")
 
 
-def _memoize_shortest_path_for_immutable_graph(
-    gr: nx.Graph, source: str, target: str
-) -> int:
-    path = (source, target)
-    if path in _shortest_path_lengths:
-        return _shortest_path_lengths[path]
+ShortestPathLengths = dict[str, dict[str, int]]
+
+
+@memoize(scope="input", maxsize=None)
+def _shortest_path_lengths_for_immutable_graph(gr: nx.Graph) -> ShortestPathLengths:
+    csr = graphs.from_networkx(gr)
+    dist = graphs.all_pairs_shortest_paths(csr)
+    # Nested dicts of ints are faster to look up in the search than the array.
+    return {
+        str(u): {str(v): int(d) for v, d in zip(csr.labels, row) if np.isfinite(d)}
+        for u, row in zip(csr.labels, dist)
+    }
 
-    path_len = nx.shortest_path_length(gr, source=source, target=target)
-    assert isinstance(path_len, int)
-    _shortest_path_lengths[path] = path_len
-    return path_len
+
+def _find_shortest_dist(
+    lengths: ShortestPathLengths, nodes: Iterable[str], target: str
+) -> int:
+    return min([lengths[n][target] for n in nodes])
 
 
-def _find_shortest_dist(gr: nx.Graph, nodes: Iterable[str], target: str) -> int:
-    return min(
-        [_memoize_shortest_path_for_immutable_graph(gr, n, target) for n in nodes]
+def _potential_max_score_bench_args() -> tuple[tuple[nx.Graph, ValvePath], dict]:
+    gr = convert_valve_info_to_directed_multigraph(
+        parse_valve_data(example_input).values()
     )
+    return (gr, ValvePath(["AA"], 30, score=0, opened_valves=set())), {}
 
 
+@microbenchmark(_potential_max_score_bench_args)
 def calculate_potential_max_score(gr: nx.Graph, path: ValvePath) -> int:
     """Calculate the maximum possible flow rate from the current state.
 
@@ -221,10 +236,13 @@ def calculate_potential_max_score(gr: nx.Graph, path: ValvePath) -> int:
         valves could be taken.
     """
     potential_score = path.score
+    lengths = _shortest_path_lengths_for_immutable_graph(gr)
     for valve in gr.nodes:
         if "open" not in valve or valve in path.opened_valves:
             continue
-        remaining_time = path.steps_left - _find_shortest_dist(gr, path.nodes, valve)
+        remaining_time = path.steps_left - _find_shortest_dist(
+            lengths, path.nodes, valve
+        )
         if remaining_time <= 0:
             continue
         potential_score += remaining_time * gr.nodes[valve]["flow_rate"]
@@ -247,6 +265,7 @@ def find_max_flow_path(
     #   2. If there are no steps left
     #   3. If all the valves have been visited already.
     #   4. If possible maximum score is less than the current max score.
+    _states_explored.inc()
     if (
         tracker.have_seen_path(path)
         or path.steps_left == 0
@@ -254,6 +273,7 @@ def find_max_flow_path(
         or calculate_potential_max_score(gr, path) <= tracker.top_score
     ):
         tracker.update(path)
+        _states_pruned.inc()
         return
 
     # Iterate over possible next steps and recurse into this function.
@@ -280,12 +300,13 @@ def puzzle_1(valves: Iterable[Valve], depth: int) -> int:
     """Puzzle 1."""
     gr = convert_valve_info_to_directed_multigraph(valves)
     tracker = PathTracker()
-    find_max_flow_path(
-        gr,
-        path=ValvePath(["AA"], depth, score=0, opened_valves=set()),
-        tracker=tracker,
-        all_valves=_collect_all_valve_names(gr),
-    )
+    with registry.scope("input"):
+        find_max_flow_path(
+            gr,
+            path=ValvePath(["AA"], depth, score=0, opened_valves=set()),
+            tracker=tracker,
+            all_valves=_collect_all_valve_names(gr),
+        )
     return tracker.top_score
 
 
@@ -294,12 +315,13 @@ def puzzle_2(valves: Iterable[Valve], depth: int) -> int:
     """Puzzle 2."""
     gr = convert_valve_info_to_directed_multigraph(valves)
     tracker = PathTracker()
-    find_max_flow_path(
-        gr,
-        path=ValvePath(["AA", "AA"], depth, score=0, opened_valves=set()),
-        tracker=tracker,
-        all_valves=_collect_all_valve_names(gr),
-    )
+    with registry.scope("input"):
+        find_max_flow_path(
+            gr,
+            path=ValvePath(["AA", "AA"], depth, score=0, opened_valves=set()),
+            tracker=tracker,
+            all_valves=_collect_all_valve_names(gr),
+        )
     return tracker.top_score
 
 
@@ -0,0 +1,189 @@
+"""Scheduling the puzzles across threads and processes.
+
+Days are ordered longest-first from their recorded run times (the "LPT" rule for
+minimizing makespan) and each day is sent to a thread if it spends most of its
+time with the GIL released (e.g. in NumPy) or to a separate process otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from enum import Enum
+from pathlib import Path
+from types import TracebackType
+
+# Minimum fraction of time with the GIL free for a day to run in a thread.
+GIL_FREE_THRESHOLD: float = 0.75
+
+# Minimum number of GIL probe wakeups for the fraction to be trusted.
+MIN_GIL_PROBE_WAKEUPS: int = 20
+
+
+class Executor(str, Enum):
+    """Where a day is executed."""
+
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+@dataclass
+class DayProfile:
+    """Recorded profile of running a single day."""
+
+    seconds: float
+    gil_free: float
+    wakeups: int = 0
+
+
+@dataclass
+class ScheduledDay:
+    """A day with its predicted run time and executor."""
+
+    day: int
+    seconds: float
+    executor: Executor
+
+
+class TimingHistory:
+    """Per-day profiles recorded from previous runs."""
+
+    def __init__(self, profiles: dict[int, DayProfile] | None = None) -> None:
+        self.profiles: dict[int, DayProfile] = profiles or {}
+
+    @classmethod
+    def load(cls, path: Path) -> TimingHistory:
+        """Load the history from a JSON file (empty if the file does not exist)."""
+        if not path.exists():
+            return cls()
+        data = json.loads(path.read_text())
+        return cls({int(day): DayProfile(**p) for day, p in data.items()})
+
+    def save(self, path: Path) -> None:
+        """Save the history to a JSON file."""
+        data = {str(d): asdict(p) for d, p in sorted(self.profiles.items())}
+        path.write_text(json.dumps(data, indent=2) + "\n")
+
+    def record(self, day: int, profile: DayProfile) -> None:
+        """Record the latest profile for a day."""
+        self.profiles[day] = profile
+
+
+class GILProbe:
+    """Estimate how much of the time the GIL is free for other threads.
+
+    A background thread repeatedly sleeps for a short interval and measures how
+    late it wakes up. If another thread is running Python code it holds the GIL
+    and the probe must wait for a forced switch (`sys.getswitchinterval()`),
+    whereas if the GIL is free (e.g. during a NumPy operation) it wakes on time.
+    The probe sleeps almost all of the time so it barely slows the measured code.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.n_wakeups = 0
+        self.n_free = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> GILProbe:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._probe_loop, name="gil-probe", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def gil_free(self) -> float:
+        """Fraction of the probe's wakeups that did not wait for the GIL."""
+        return self.n_free / self.n_wakeups if self.n_wakeups > 0 else 0.0
+
+    def _probe_loop(self) -> None:
+        late = sys.getswitchinterval() / 2
+        while not self._stop.is_set():
+            t0 = time.perf_counter()
+            time.sleep(self.interval)
+            self.n_wakeups += 1
+            if time.perf_counter() - t0 - self.interval < late:
+                self.n_free += 1
+
+
+def profile_day(fxn: Callable[[], None]) -> DayProfile:
+    """Run a day's puzzles and record its run time and GIL usage."""
+    with GILProbe() as probe:
+        t0 = time.perf_counter()
+        fxn()
+        seconds = time.perf_counter() - t0
+    return DayProfile(seconds=seconds, gil_free=probe.gil_free, wakeups=probe.n_wakeups)
+
+
+def make_schedule(days: Iterable[int], history: TimingHistory) -> list[ScheduledDay]:
+    """Order days longest-first and choose an executor for each.
+
+    Days without a recorded profile are scheduled first (as their run time is
+    unknown) and run in a separate process. Days only run in a thread if the GIL
+    probe woke up at least `MIN_GIL_PROBE_WAKEUPS` times while profiling them.
+
+    Args:
+        days (Iterable[int]): Days to schedule.
+        history (TimingHistory): Profiles from previous runs.
+
+    Returns:
+        list[ScheduledDay]: Days in the order they should be started.
+    """
+    schedule: list[ScheduledDay] = []
+    for day in days:
+        if (p := history.profiles.get(day)) is None:
+            schedule.append(ScheduledDay(day, float("inf"), Executor.PROCESS))
+            continue
+        gil_free = (
+            p.wakeups >= MIN_GIL_PROBE_WAKEUPS and p.gil_free >= GIL_FREE_THRESHOLD
+        )
+        executor = Executor.THREAD if gil_free else Executor.PROCESS
+        schedule.append(ScheduledDay(day, p.seconds, executor))
+    schedule.sort(key=lambda s: s.seconds, reverse=True)
+    return schedule
+
+
+def run_schedule(
+    schedule: list[ScheduledDay], run_day: Callable[[int], None], workers: int
+) -> None:
+    """Run the scheduled days with at most `workers` running at once.
+
+    Each day is started as soon as a worker is free, in the order of the schedule.
+
+    Args:
+        schedule (list[ScheduledDay]): Scheduled days.
+        run_day (Callable[[int], None]): Function that runs a single day (must be
+        picklable for days run in a process).
+        workers (int): Maximum number of days to run concurrently.
+    """
+    assert workers > 0, "Must have at least one worker."
+    slots = threading.Semaphore(workers)
+    futures: list[Future] = []
+    with ThreadPoolExecutor(workers) as threads, ProcessPoolExecutor(workers) as procs:
+        for item in schedule:
+            slots.acquire()
+            pool = threads if item.executor is Executor.THREAD else procs
+            fut = pool.submit(run_day, item.day)
+            fut.add_done_callback(lambda _: slots.release())
+            futures.append(fut)
+        for fut in futures:
+            fut.result()